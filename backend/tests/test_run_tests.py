@@ -0,0 +1,249 @@
+"""Tests for run_tests.py: the pass-marker hash, per-file runs and the pytest daemon."""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import run_tests
+
+@pytest.fixture
+def socket_pair():
+    """A connected pair of Unix stream sockets."""
+    client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    yield client, server
+    client.close()
+    server.close()
+
+
+@pytest.fixture
+def pipe():
+    """A pipe whose write end is passed to the daemon as a stdio stand-in."""
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    for fd in (read_fd, write_fd):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def suite_tree(tmp_path, monkeypatch):
+    """A minimal project tree holding every kind of suite source, as the cwd."""
+    for path, content in {
+        "backend/app/main.py": "app = None\n",
+        "backend/tests/test_app.py": "def test_app(): pass\n",
+        "scenarios/analyzer.py": "THRESHOLD = 1\n",
+        "scenarios/reports/audit_x.ndjson": "{}\n",
+        "run_tests.py": "# runner\n",
+        "pyproject.toml": "[project]\n",
+        "uv.lock": "version = 1\n",
+    }.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestSuiteHash:
+    """What invalidates the cached pass marker of the unit suite."""
+
+    @pytest.mark.parametrize("path", [
+        "scenarios/analyzer.py", "backend/app/main.py", "backend/tests/test_app.py", "run_tests.py",
+    ])
+    def test_editing_a_tested_source_changes_the_hash(self, suite_tree, path):
+        before = run_tests._suite_hash()
+
+        (suite_tree / path).write_text("# edited\n")
+
+        assert run_tests._suite_hash() != before
+
+    def test_new_scenario_module_changes_the_hash(self, suite_tree):
+        before = run_tests._suite_hash()
+
+        (suite_tree / "scenarios" / "_kernels.py").write_text("")
+
+        assert run_tests._suite_hash() != before
+
+    def test_scenario_reports_do_not_change_the_hash(self, suite_tree):
+        before = run_tests._suite_hash()
+
+        (suite_tree / "scenarios/reports/audit_x.ndjson").write_text('{"changed": true}\n')
+
+        assert run_tests._suite_hash() == before
+
+
+@pytest.mark.skipif(not hasattr(socket, "send_fds"), reason="needs SCM_RIGHTS fd passing")
+class TestDaemonProtocol:
+    """Framing of the requests sent to the pytest daemon."""
+
+    def test_round_trip_with_fds(self, socket_pair, pipe):
+        """A request and its descriptors arrive intact."""
+        client, server = socket_pair
+        read_fd, write_fd = pipe
+        request = {"key": "k", "cwd": "/tmp", "args": ["-q"], "env": {"A": "1"}}
+
+        run_tests._send_request(client, request, [write_fd])
+        received, fds = run_tests._recv_request(server)
+
+        assert received == request
+        assert len(fds) == 1
+        os.write(fds[0], b"ok")
+        os.close(fds[0])
+        assert os.read(read_fd, 2) == b"ok"
+
+    def test_large_request_split_across_reads(self, socket_pair, pipe):
+        """A request larger than one read is reassembled, not parsed in pieces."""
+        client, server = socket_pair
+        _, write_fd = pipe
+        request = {"key": "k", "env": {f"VAR_{i}": "x" * 512 for i in range(8192)}}
+
+        # The payload exceeds the socket buffer, so the sender blocks until read
+        sender = threading.Thread(target=run_tests._send_request, args=(client, request, [write_fd]))
+        sender.start()
+        received, fds = run_tests._recv_request(server)
+        sender.join()
+
+        assert received == request
+        for fd in fds:
+            os.close(fd)
+
+    def test_truncated_request_is_rejected(self, socket_pair, pipe):
+        """A connection closed mid-request raises ValueError and closes the fds."""
+        client, server = socket_pair
+        _, write_fd = pipe
+
+        socket.send_fds(client, [b'{"key": "k", "args": ['], [write_fd])
+        client.shutdown(socket.SHUT_WR)
+
+        fds_before = set(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+        with pytest.raises(ValueError):
+            run_tests._recv_request(server)
+        if fds_before is not None:
+            assert set(os.listdir("/proc/self/fd")) <= fds_before
+
+
+@pytest.fixture
+def fake_pytest(monkeypatch):
+    """Run ``run_file_tests`` commands as Python snippets named by their last argument."""
+    real_popen, real_run = subprocess.Popen, subprocess.run
+    monkeypatch.setattr(run_tests, "_test_env", lambda: dict(os.environ))
+
+    def script(cmd):
+        return [sys.executable, "-c", cmd[-1]]
+
+    monkeypatch.setattr(run_tests.subprocess, "Popen", lambda cmd, **kw: real_popen(script(cmd), **kw))
+    monkeypatch.setattr(run_tests.subprocess, "run", lambda cmd, **kw: real_run(script(cmd), **kw))
+
+
+def noisy_file(name: str, returncode: int, delay: float) -> str:
+    """A stand-in test file that prints three lines slowly, then exits."""
+    return (f"import sys, time\n"
+            f"for i in range(3):\n"
+            f"    print('{name}', i, flush=True)\n"
+            f"    time.sleep({delay})\n"
+            f"sys.exit({returncode})\n")
+
+
+class TestFileTests:
+    """Exit status and output of the per-file parallel runs."""
+
+    @pytest.mark.parametrize("codes,passed", [
+        ((0,), True),
+        ((5,), False),
+        ((5, 5), False),
+        ((0, 5), True),
+        ((0, 1), False),
+    ])
+    def test_result(self, fake_pytest, codes, passed):
+        files = [f"import sys; sys.exit({code})" for code in codes]
+
+        assert run_tests.run_file_tests(files, []) is passed
+
+    def test_outputs_are_printed_as_blocks(self, fake_pytest, capfd):
+        files = [noisy_file("first", 0, 0.05), noisy_file("second", 0, 0.03)]
+
+        assert run_tests.run_file_tests(files, [])
+
+        lines = [line for line in capfd.readouterr().out.splitlines() if line.startswith(("first", "second"))]
+        assert lines == [f"first {i}" for i in range(3)] + [f"second {i}" for i in range(3)]
+
+
+@pytest.fixture
+def fake_daemon(tmp_path, monkeypatch):
+    """Serve one daemon connection with ``reply`` (None closes without one)."""
+    path = tmp_path / "d.sock"
+    monkeypatch.setattr(run_tests, "DAEMON_SOCKET", path)
+    monkeypatch.setattr(run_tests, "_daemon_key", lambda: "k")
+    monkeypatch.setattr(run_tests, "_test_env", lambda: {})
+    threads = []
+
+    def serve(reply):
+        path.unlink(missing_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(path))
+        server.listen()
+
+        def handle():
+            with server:
+                conn, _ = server.accept()
+                with conn:
+                    _, fds = run_tests._recv_request(conn)
+                    for fd in fds:
+                        os.close(fd)
+                    if reply is not None:
+                        conn.sendall(reply)
+
+        thread = threading.Thread(target=handle)
+        thread.start()
+        threads.append(thread)
+
+    yield serve
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.skipif(not hasattr(socket, "send_fds"), reason="needs SCM_RIGHTS fd passing")
+class TestDaemonClient:
+    """How run_daemon_tests reacts to what the daemon sends back."""
+
+    @pytest.fixture
+    def restarts(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(run_tests, "_start_pytest_daemon", lambda key: calls.append(key) or False)
+        monkeypatch.setattr(run_tests, "run_file_tests", lambda files, args: calls.append("direct") or True)
+        return calls
+
+    def test_reported_result_is_returned(self, fake_daemon, restarts):
+        fake_daemon(b'{"returncode": 1}\n')
+
+        assert run_tests.run_daemon_tests(["t.py"], []) is False
+        assert restarts == []
+
+    def test_run_without_reply_fails_without_restart(self, fake_daemon, restarts):
+        fake_daemon(None)
+
+        assert run_tests._daemon_request("k", []) == {}
+        fake_daemon(None)
+        assert run_tests.run_daemon_tests(["t.py"], []) is False
+        assert restarts == []
+
+    def test_stale_daemon_is_replaced(self, fake_daemon, restarts):
+        fake_daemon(b'{"stale": true}\n')
+
+        run_tests.run_daemon_tests(["t.py"], [])
+
+        assert restarts == ["k", "direct"]
+
+    def test_missing_daemon_is_started(self, fake_daemon, restarts):
+        assert run_tests._daemon_request("k", []) is None
+
+        run_tests.run_daemon_tests(["t.py"], [])
+
+        assert restarts == ["k", "direct"]
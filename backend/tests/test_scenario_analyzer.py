@@ -0,0 +1,165 @@
+"""Tests for the scenario analyzer: input formats, caching and report shape."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'scenarios'))
+
+import analyzer as analyzer_module
+from analyzer import ScenarioAnalyzer
+
+
+def make_audit(steps: int = 4) -> dict:
+    """A small audit in the runner's format; a tariff trigger fires at timestep 2."""
+    trail = []
+    for t in range(1, steps + 1):
+        fired = ["tariff_shock"] if t == 2 else []
+        changes = [
+            {
+                "field_path": "countries.USA.macro.policy_rate",
+                "old_value": 0.05 + 0.001 * (t - 1),
+                "new_value": 0.05 + 0.001 * t,
+                "reducer_name": "monetary_policy",
+                "calculation_details": {},
+            },
+            {
+                "field_path": "countries.USA.trade.tariff_mfn_avg",
+                "old_value": 0.03,
+                "new_value": 0.25 if t == 2 else 0.03,
+                "reducer_name": "trade_update",
+                "calculation_details": {"trigger_action": True} if fired else {},
+            },
+        ]
+        trail.append({
+            "timestep": t,
+            "state": {
+                "countries": {
+                    "USA": {"macro": {"inflation": 0.03 - 0.001 * t, "policy_rate": 0.05 + 0.001 * t,
+                                      "unemployment": 0.04, "debt_gdp": 1}},
+                    "CHN": {"macro": {"inflation": 0.02, "policy_rate": 0.035, "unemployment": 0.05}},
+                },
+            },
+            "audit": {
+                "field_changes": changes,
+                "triggers_fired": fired,
+                "reducer_sequence": ["monetary_policy", "trade_update"],
+            },
+        })
+    return {
+        "scenario_name": "Tariff Test",
+        "timesteps_completed": steps,
+        "execution_time": 0.5,
+        "audit_trail": trail,
+    }
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    """An analyzer writing its reports and cache under a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return ScenarioAnalyzer()
+
+
+@pytest.fixture
+def audit_file(tmp_path):
+    path = tmp_path / "audit_tariff_test.json"
+    path.write_text(json.dumps(make_audit()))
+    return path
+
+
+@pytest.fixture
+def ndjson_audit_file(tmp_path):
+    """The same audit as ``audit_file``, written as a header line plus one line per step."""
+    audit = make_audit()
+    trail = audit.pop("audit_trail")
+    path = tmp_path / "audit_tariff_test.ndjson"
+    path.write_text("\n".join(json.dumps(record) for record in [audit, *trail]) + "\n")
+    return path
+
+
+def normalize(analysis: dict) -> dict:
+    """An analysis as plain JSON values, so tuples, NumPy scalars and insights compare equal."""
+    return json.loads(json.dumps(analysis, default=analyzer_module._cache_default))
+
+
+class TestAnalysisEquivalence:
+    """Every way of reading an audit gives the same analysis."""
+
+    @pytest.mark.parametrize("streaming", [False, True], ids=["in-memory", "streaming"])
+    def test_json_and_ndjson_agree(self, analyzer, audit_file, ndjson_audit_file, monkeypatch, streaming):
+        if streaming:
+            monkeypatch.setattr(analyzer_module, "STREAM_THRESHOLD_BYTES", -1)
+            if not analyzer_module.HAS_IJSON:
+                pytest.skip("streaming a JSON audit needs ijson")
+
+        from_json = normalize(analyzer.analyze_scenario(audit_file))
+        from_ndjson = normalize(analyzer.analyze_scenario(ndjson_audit_file))
+
+        assert from_json == from_ndjson
+        assert from_json["scenario_name"] == "Tariff Test"
+        assert from_json["execution_summary"]["timesteps_completed"] == 4
+
+    def test_streaming_matches_in_memory(self, analyzer, tmp_path, ndjson_audit_file, monkeypatch):
+        in_memory = normalize(analyzer.analyze_scenario(ndjson_audit_file))
+
+        monkeypatch.setattr(analyzer_module, "STREAM_THRESHOLD_BYTES", -1)
+        monkeypatch.setattr(analyzer_module, "ANALYSIS_CACHE_VERSION", -1)  # bypass the cache
+        streamed = normalize(analyzer.analyze_scenario(ndjson_audit_file))
+
+        assert streamed == in_memory
+
+    def test_cached_analysis_matches_fresh(self, analyzer, audit_file, monkeypatch):
+        fresh = analyzer.analyze_scenario(audit_file)
+
+        def no_scan(audit_trail):
+            raise AssertionError("an unchanged audit file should not be scanned again")
+
+        monkeypatch.setattr(ScenarioAnalyzer, "_scan", staticmethod(no_scan))
+        cached = analyzer.analyze_scenario(audit_file)
+
+        assert normalize(cached) == normalize(fresh)
+        assert [type(insight) for insight in cached["key_insights"]] == \
+            [type(insight) for insight in fresh["key_insights"]]
+
+    def test_changed_file_is_analyzed_again(self, analyzer, audit_file):
+        analyzer.analyze_scenario(audit_file)
+
+        audit = make_audit(steps=5)
+        audit_file.write_text(json.dumps(audit))
+        os.utime(audit_file, ns=(0, audit_file.stat().st_mtime_ns + 1_000_000))
+
+        assert analyzer.analyze_scenario(audit_file)["execution_summary"]["timesteps_completed"] == 5
+
+
+class TestReportShape:
+    """The column layout of series in the written JSON report."""
+
+    def test_report_series_are_columns(self, analyzer, audit_file):
+        report_file = analyzer.generate_detailed_report(audit_file, run_timestamp="20240101_000000")
+        report = json.loads(report_file.read_text())
+
+        trajectory = report["state_evolution"]["countries.USA.macro.debt_gdp"]["trajectory"]
+        assert trajectory == {"timesteps": [1, 2, 3, 4], "values": [1.0, 1.0, 1.0, 1.0]}
+        assert all(isinstance(value, float) for value in trajectory["values"])
+
+        trigger = report["trigger_analysis"]["triggers_fired"]["tariff_shock"]
+        assert trigger["first_fired"] == 2
+        assert trigger["fire_count"] == 1
+        # (step index, change index) of the trigger-driven tariff change
+        assert trigger["associated_changes"] == [[1, 1]]
+
+        assert report["trigger_analysis"]["firing_sequence"] == {
+            "timesteps": [2],
+            "triggers": ["tariff_shock"],
+        }
+
+    def test_markdown_summary_renders_columns(self, analyzer, audit_file):
+        report_file = analyzer.generate_detailed_report(audit_file, run_timestamp="20240101_000000")
+        summary = report_file.with_suffix(".md").read_text()
+
+        assert "### countries.USA.macro.policy_rate" in summary
+        assert "### tariff_shock" in summary
+        assert "- **Associated Changes**: 1" in summary
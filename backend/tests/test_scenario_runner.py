@@ -0,0 +1,208 @@
+"""Tests for the scenario runner's /step retry classification."""
+
+import os
+import sys
+
+import httpx
+import pytest
+import pytest_asyncio
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'scenarios'))
+
+import runner as runner_module
+from runner import EnhancedScenarioRunner, StepAuditLost
+
+SCENARIO_URL = "/api/v1/simulation/scenarios/s1"
+STEP_URL = f"{SCENARIO_URL}/step"
+
+
+class FakeSimulation:
+    """A scenario endpoint whose /step responses follow a script.
+
+    Each script entry is ``"ok"``, a status code, or an httpx exception
+    class, paired with whether the server applied the step before failing.
+    Reads of the scenario fail with a 500 while ``reads_fail`` is set.
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.current_timestep = 0
+        self.requests = []
+        self.reads_fail = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        if request.method == "POST" and request.url.path == STEP_URL:
+            outcome, applied = self.script.pop(0)
+            if applied or outcome == "ok":
+                self.current_timestep += 1
+            if outcome == "ok":
+                return httpx.Response(200, json={"timestep": self.current_timestep, "source": "step"})
+            if isinstance(outcome, int):
+                return httpx.Response(outcome)
+            raise outcome("simulated failure", request=request)
+        if self.reads_fail:
+            return httpx.Response(500)
+        if request.url.path == SCENARIO_URL:
+            return httpx.Response(200, json={"current_timestep": self.current_timestep})
+        return httpx.Response(404)
+
+    @property
+    def posts(self) -> int:
+        return sum(1 for method, _ in self.requests if method == "POST")
+
+    @property
+    def reads(self) -> int:
+        return sum(1 for method, _ in self.requests if method == "GET")
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry immediately instead of sleeping between attempts."""
+    monkeypatch.setattr(runner_module, "STEP_RETRY_MAX_DELAY", 0)
+    monkeypatch.setattr(runner_module.random, "random", lambda: 0.0)
+
+
+@pytest_asyncio.fixture
+async def make_runner():
+    """Build a runner whose client talks to a FakeSimulation."""
+    clients = []
+
+    def make(simulation: FakeSimulation) -> EnhancedScenarioRunner:
+        runner = EnhancedScenarioRunner(token_cache=None)
+        runner.client = httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(simulation))
+        clients.append(runner.client)
+        return runner
+
+    yield make
+    for client in clients:
+        await client.aclose()
+
+
+async def post_step(runner: EnhancedScenarioRunner) -> tuple:
+    log_lines = []
+    response = await runner._post_step("s1", 0, 1, log_lines)
+    return response, log_lines
+
+
+class TestStepRetry:
+    """Which /step failures are retried, read back, or returned."""
+
+    async def test_unavailable_is_retried_without_read_back(self, make_runner):
+        simulation = FakeSimulation((503, False), ("ok", False))
+
+        response, log_lines = await post_step(make_runner(simulation))
+
+        assert response.json() == {"timestep": 1, "source": "step"}
+        assert (simulation.posts, simulation.reads) == (2, 0)
+        assert len(log_lines) == 1 and "503" in log_lines[0]
+
+    async def test_connect_error_is_retried_without_read_back(self, make_runner):
+        simulation = FakeSimulation((httpx.ConnectError, False), ("ok", False))
+
+        response, log_lines = await post_step(make_runner(simulation))
+
+        assert response.json()["source"] == "step"
+        assert (simulation.posts, simulation.reads) == (2, 0)
+        assert "ConnectError" in log_lines[0]
+
+    @pytest.mark.parametrize("status", [502, 504])
+    async def test_proxy_error_is_read_back_before_retry(self, make_runner, status):
+        simulation = FakeSimulation((status, False), ("ok", False))
+
+        response, _ = await post_step(make_runner(simulation))
+
+        assert response.json() == {"timestep": 1, "source": "step"}
+        assert (simulation.posts, simulation.reads) == (2, 1)
+
+    async def test_server_error_after_apply_is_not_stepped_again(self, make_runner):
+        simulation = FakeSimulation((500, True))
+
+        with pytest.raises(StepAuditLost, match="Step 1 was applied"):
+            await post_step(make_runner(simulation))
+        assert simulation.posts == 1
+        assert simulation.current_timestep == 1
+
+    async def test_server_error_before_apply_is_retried(self, make_runner):
+        simulation = FakeSimulation((500, False), ("ok", False))
+
+        response, _ = await post_step(make_runner(simulation))
+
+        assert response.json() == {"timestep": 1, "source": "step"}
+        assert (simulation.posts, simulation.reads) == (2, 1)
+        assert simulation.current_timestep == 1
+
+    async def test_dropped_response_after_apply_is_not_stepped_again(self, make_runner):
+        simulation = FakeSimulation((httpx.ReadTimeout, True))
+
+        with pytest.raises(StepAuditLost):
+            await post_step(make_runner(simulation))
+        assert simulation.posts == 1
+        assert simulation.current_timestep == 1
+
+    async def test_client_error_is_returned_immediately(self, make_runner):
+        simulation = FakeSimulation((404, False))
+
+        response, log_lines = await post_step(make_runner(simulation))
+
+        assert response.status_code == 404
+        assert simulation.requests == [("POST", STEP_URL)]
+        assert log_lines == []
+
+    async def test_server_error_is_returned_when_read_back_fails(self, make_runner):
+        simulation = FakeSimulation((500, False), ("ok", False))
+        simulation.reads_fail = True
+
+        response, _ = await post_step(make_runner(simulation))
+
+        assert response.status_code == 500
+        assert simulation.posts == 1
+
+    async def test_gives_up_after_max_attempts(self, make_runner):
+        attempts = runner_module.STEP_MAX_ATTEMPTS
+        simulation = FakeSimulation(*[(503, False)] * attempts)
+
+        response, log_lines = await post_step(make_runner(simulation))
+
+        assert response.status_code == 503
+        assert simulation.posts == attempts
+        assert len(log_lines) == attempts - 1
+
+    async def test_connect_error_on_last_attempt_is_raised(self, make_runner):
+        attempts = runner_module.STEP_MAX_ATTEMPTS
+        simulation = FakeSimulation(*[(httpx.ConnectError, False)] * attempts)
+
+        with pytest.raises(httpx.ConnectError):
+            await post_step(make_runner(simulation))
+        assert simulation.posts == attempts
+
+
+class TestLostStepAudit:
+    """A scenario whose applied step lost its audit fails instead of recording it."""
+
+    async def test_scenario_fails_with_explicit_error(self, make_runner):
+        simulation = FakeSimulation(("ok", False), (500, True))
+        runner = make_runner(simulation)
+
+        def handler(request):
+            if request.method == "POST" and request.url.path == "/api/v1/simulation/scenarios":
+                return httpx.Response(200, json={"id": "s1", "current_timestep": 0})
+            response = simulation(request)
+            if request.method == "POST" and response.status_code == 200:
+                audit = {"field_changes": [], "triggers_fired": [], "reducer_sequence": []}
+                return httpx.Response(200, json={"timestep": simulation.current_timestep, "state": {}, "audit": audit})
+            return response
+
+        runner.client = httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(handler))
+        scenario = {"name": "Lost", "description": "", "complexity": "low", "initial_state": {}, "expected_duration": 3}
+        try:
+            result = await runner.execute_scenario(scenario)
+        finally:
+            await runner.client.aclose()
+        if result.audit_spool is not None:
+            result.audit_spool.close()
+
+        assert not result.success
+        assert result.error_message == "Step 2 was applied but its audit could not be recovered"
+        assert result.timesteps_completed == 1
+        assert simulation.posts == 2
@@ -0,0 +1,203 @@
+"""Tests for the audit index and economic validators used by the scenario runner."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'scenarios'))
+
+from _validators import KERNEL_MIN_LENGTH, AuditIndex, EconomicValidator, flatten
+
+
+def make_step(timestep: int, usa: dict = None, chn: dict = None, eur: dict = None,
+              triggers: list = None) -> dict:
+    """One audit-trail step; each country dict maps section -> fields."""
+    countries = {code: data for code, data in (("USA", usa), ("CHN", chn), ("EUR", eur)) if data is not None}
+    return {
+        "timestep": timestep,
+        "state": {"countries": countries},
+        "audit": {"field_changes": [], "triggers_fired": triggers or [], "reducer_sequence": []},
+    }
+
+
+INITIAL_STATE = {
+    "countries": {
+        "USA": {"macro": {"inflation": 0.04, "policy_rate": 0.03, "inflation_target": 0.02}},
+    },
+}
+
+
+@pytest.fixture
+def validator():
+    return EconomicValidator()
+
+
+def check(validator: EconomicValidator, name: str, index: AuditIndex, initial_state: dict = INITIAL_STATE):
+    return validator.validate_relationship(name, "test", None, initial_state, index=index)
+
+
+class TestAuditIndex:
+    """Folding steps into the index."""
+
+    def test_collects_series_and_first_trigger(self):
+        trail = [
+            make_step(1, usa={"trade": {"tariff_mfn_avg": 0.03}}, chn={"trade": {"tariff_mfn_avg": 0.05}},
+                      eur={"external": {"fx_rate": 1.1}, "finance": {"credit_spread": 0.02}}),
+            make_step(2, usa={"trade": {"tariff_mfn_avg": 0.25}, "external": {"fx_rate": 1.0}},
+                      triggers=["tariff_shock"]),
+            make_step(3, usa={"macro": {"inflation": 0.05}}, triggers=["other"]),
+        ]
+
+        index = AuditIndex.from_audit_trail(trail, field_paths=("countries.USA.macro.inflation",))
+
+        assert index.steps == 3
+        assert index.us_tariffs == [0.03, 0.25]
+        assert index.chn_tariffs == [0.05]
+        assert index.fx_rates == [(1, "EUR", 1.1)]  # USD rates are not tracked
+        assert index.spreads == [(1, "EUR", 0.02)]
+        assert index.trigger_fired and index.first_trigger_timestep == 2
+        assert index.field_values == {"countries.USA.macro.inflation": [(3, 0.05)]}
+        assert index.last_state == trail[-1]["state"]
+
+    def test_observing_incrementally_matches_from_audit_trail(self):
+        trail = [make_step(t, usa={"trade": {"tariff_mfn_avg": 0.01 * t}}) for t in range(1, 6)]
+
+        index = AuditIndex(field_paths=("countries.USA.trade.tariff_mfn_avg",))
+        for step in trail:
+            index.observe(step)
+
+        assert index == AuditIndex.from_audit_trail(trail, field_paths=("countries.USA.trade.tariff_mfn_avg",))
+
+    @pytest.mark.parametrize("step", [
+        {"timestep": 1},
+        {"timestep": 1, "state": None, "audit": None},
+        {"timestep": 1, "state": {"countries": ["USA"]}, "audit": {"triggers_fired": None}},
+        {"timestep": 1, "state": {"countries": {"USA": None, "CHN": {"trade": 0.1, "finance": [1]}}}},
+    ], ids=["empty", "null-sections", "countries-list", "malformed-country"])
+    def test_malformed_steps_are_skipped(self, step):
+        index = AuditIndex(field_paths=("countries.USA.macro.inflation",))
+
+        index.observe(step)
+
+        assert index.steps == 1
+        assert index.us_tariffs == index.chn_tariffs == index.fx_rates == index.spreads == []
+        assert index.field_values == {"countries.USA.macro.inflation": []}
+        assert not index.trigger_fired
+
+
+class TestEconomicValidator:
+    """Each relationship check against small hand-built trails."""
+
+    @pytest.mark.parametrize("usa_tariffs,passed", [
+        ([0.03, 0.05, 0.25], True),
+        ([0.03, 0.05, 0.1], False),
+        ([0.3], False),
+        ([], False),
+    ])
+    def test_tariff_escalation(self, validator, usa_tariffs, passed):
+        index = AuditIndex(us_tariffs=usa_tariffs)
+
+        assert check(validator, "tariffs_increase_over_time", index).passed is passed
+
+    @pytest.mark.parametrize("rates,passed", [
+        ([1.0, 1.05, 1.12], True),
+        ([1.0, 1.05, 1.1], False),
+        ([1.2, 1.0, 1.1], False),  # measured from the first rate, not the lowest
+    ])
+    def test_currency_devaluation(self, validator, rates, passed):
+        index = AuditIndex(fx_rates=[(t, "EUR", rate) for t, rate in enumerate(rates, 1)])
+
+        assert check(validator, "fx_rate_increases_in_crisis", index).passed is passed
+
+    def test_currency_devaluation_is_per_country(self, validator):
+        # EUR at 1.0 and JPY at 150 never move 10% from their own baselines
+        rows = [(t, code, rate) for t in range(1, 4) for code, rate in (("EUR", 1.0), ("JPY", 150.0))]
+
+        assert not check(validator, "fx_rate_increases_in_crisis", AuditIndex(fx_rates=rows)).passed
+
+    @pytest.mark.parametrize("length", [3, KERNEL_MIN_LENGTH + 1], ids=["python", "kernel"])
+    def test_series_paths_agree(self, validator, length):
+        spreads = [(t, "EUR", 0.02) for t in range(length)]
+        spreads[-1] = (length - 1, "EUR", 0.04)
+        index = AuditIndex(
+            us_tariffs=[0.03] * (length - 1) + [0.2],
+            fx_rates=[(t, "EUR", 1.0) for t in range(length - 1)] + [(length - 1, "EUR", 1.2)],
+            spreads=spreads,
+        )
+
+        assert check(validator, "tariffs_increase_over_time", index).details["us_tariff_range"] == (0.03, 0.2)
+        assert check(validator, "fx_rate_increases_in_crisis", index).passed
+        result = check(validator, "credit_spreads_widen_with_bank_stress", index)
+        assert result.passed
+        assert result.details["min_spread"] == (0, "EUR", 0.02)
+        assert result.details["max_spread"] == (length - 1, "EUR", 0.04)
+
+    def test_credit_spread_widening_needs_two_points(self, validator):
+        result = check(validator, "credit_spreads_widen_with_bank_stress", AuditIndex(spreads=[(1, "EUR", 0.05)]))
+
+        assert not result.passed
+        assert result.error_message is None
+
+    def test_trigger_timing(self, validator):
+        trail = [make_step(1, usa={}), make_step(2, usa={}, triggers=["tariff_shock"])]
+
+        result = check(validator, "trigger_fires_on_schedule", AuditIndex.from_audit_trail(trail))
+
+        assert result.passed
+        assert result.details["fire_timestep"] == 2
+
+    @pytest.mark.parametrize("final_rate,passed", [(0.035, True), (0.02, False)])
+    def test_taylor_rule_response(self, validator, final_rate, passed):
+        trail = [
+            make_step(1, usa={"macro": {"inflation": 0.04, "policy_rate": 0.03}}),
+            make_step(2, usa={"macro": {"inflation": 0.035, "policy_rate": final_rate}}),
+        ]
+
+        result = check(validator, "policy_rate_adjusts_for_inflation", AuditIndex.from_audit_trail(trail))
+
+        assert result.passed is passed
+        assert result.details["initial_gap"] == pytest.approx(0.02)
+
+    def test_taylor_rule_needs_two_steps(self, validator):
+        trail = [make_step(1, usa={"macro": {"inflation": 0.04, "policy_rate": 0.03}})]
+
+        result = check(validator, "policy_rate_adjusts_for_inflation", AuditIndex.from_audit_trail(trail))
+
+        assert not result.passed
+        assert result.error_message == "Insufficient timesteps for validation"
+
+    def test_audit_trail_without_index(self, validator):
+        trail = [make_step(1, usa={"trade": {"tariff_mfn_avg": 0.03}}),
+                 make_step(2, usa={"trade": {"tariff_mfn_avg": 0.3}})]
+
+        result = validator.validate_relationship("tariffs_increase_over_time", "test", trail, INITIAL_STATE)
+
+        assert result.passed
+
+    def test_missing_state_fails_only_that_check(self, validator):
+        index = AuditIndex.from_audit_trail([{"timestep": 1}, {"timestep": 2, "state": None}])
+
+        result = check(validator, "policy_rate_adjusts_for_inflation", index)
+
+        assert not result.passed
+        assert result.error_message.startswith("Validation error:")
+        assert check(validator, "trigger_fires_on_schedule", index).error_message is None
+
+    def test_unknown_check(self, validator):
+        result = check(validator, "no_such_check", AuditIndex())
+
+        assert not result.passed
+        assert result.error_message == "Unknown validation check: no_such_check"
+
+
+class TestFlatten:
+    """Dotted key paths of a nested state."""
+
+    def test_includes_inner_dicts(self):
+        assert flatten({"a": {"b": 1, "c": {"d": 2}}}) == {
+            "a": {"b": 1, "c": {"d": 2}},
+            "a.b": 1,
+            "a.c": {"d": 2},
+            "a.c.d": 2,
+        }
@@ -4,97 +4,293 @@ SlashRun Test Suite Runner
 This Python script runs both unit tests (fast, SQLite) and integration tests (slow, PostgreSQL).
 """
 
+# asyncio, http.client and concurrent.futures are imported where
+# used: the default `unit` run never touches Docker or the API, and asyncio
+# alone roughly doubles the runner's start-up time
+import hashlib
 import os
 import subprocess
 import sys
-import time
-import requests
+from collections import deque
 from pathlib import Path
 from typing import List, Optional
 
+# The runner never changes directory, so resolve it once for every subprocess
+_CWD = Path.cwd()
+
+CACHE_DIR = Path(".cache")
+UV_SYNC_STAMP = CACHE_DIR / "uv-sync.stamp"
+
+# Test files selectable by name on the command line
+TEST_FILES = {
+    "core": "backend/tests/test_simulation_core.py",
+    "api": "backend/tests/test_api.py",
+    "database": "backend/tests/test_database.py",
+}
+
+# Opt-in (--daemon) pytest server: a warm interpreter forks one child per run
+DAEMON_SOCKET = CACHE_DIR / "pytest-daemon.sock"
+DAEMON_PID = CACHE_DIR / "pytest-daemon.pid"
+DAEMON_LOG = CACHE_DIR / "pytest-daemon.log"
+# Third-party modules the daemon imports once. Application and test modules
+# are only imported inside each forked run, so edits are always picked up.
+DAEMON_PRELOAD = (
+    "pytest", "pytest_asyncio", "pytest_cov", "httpx", "fastapi", "pydantic",
+    "sqlalchemy.ext.asyncio", "sqlmodel", "aiosqlite",
+)
+
+# pyproject's addopts enable coverage for bare `pytest`; the runner only
+# instruments when `coverage` is requested
+COVERAGE_ARGS = ["--cov=backend/app", "--cov-report=html:coverage_html", "--cov-report=term-missing"]
+
+# Sources whose content decides whether a previous green unit run still holds:
+# directories, files or glob patterns. backend/tests also covers the scenario
+# tooling and this runner; generated scenario reports are left out.
+SUITE_SOURCES = ("backend/app", "backend/tests", "scenarios/*.py", "run_tests.py", "pyproject.toml", "uv.lock")
+
+# `docker compose ps` emits only the fields the readiness check reads
+COMPOSE_PS_FIELDS = ("Service", "State", "Health")
+COMPOSE_PS_FORMAT = "|".join("{{.%s}}" % field for field in COMPOSE_PS_FIELDS)
+
+# Environment shared by every pytest invocation, built on first use
+_BASE_ENV: Optional[dict] = None
+
+
+class _SuiteOutput:
+    """Stand-in for ``sys.stdout`` while the suites run concurrently.
+    
+    Writes from a thread that called :meth:`capture` are buffered for that
+    thread; everything else goes straight to the real stream.
+    """
+    
+    def __init__(self, stream):
+        import threading
+        self.stream = stream
+        self._local = threading.local()
+    
+    @property
+    def capturing(self) -> bool:
+        return getattr(self._local, "buffer", None) is not None
+    
+    def capture(self):
+        self._local.buffer = []
+    
+    def release(self) -> str:
+        """Stop buffering this thread and return what it wrote."""
+        buffer, self._local.buffer = self._local.buffer, None
+        return "".join(buffer)
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+    
+    def flush(self):
+        if not self.capturing:
+            self.stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
 
 def run_command(cmd: List[str], description: str) -> bool:
-    """Run a command and return success status."""
+    """Run a command, streaming its output, and return success status."""
     print(f"🔄 {description}...")
+    sys.stdout.flush()
+    # Keep only the tail of the output so it can be replayed next to the error
+    recent_lines = deque(maxlen=200)
     try:
-        result = subprocess.run(
-            cmd, 
-            check=True, 
-            capture_output=True, 
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            cwd=Path.cwd()
-        )
-        if result.stdout:
-            print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
+            bufsize=1,
+            cwd=_CWD
+        ) as proc:
+            for line in proc.stdout:
+                sys.stdout.write(line)
+                recent_lines.append(line)
+    except OSError as e:
         print(f"❌ Error: {e}")
-        if e.stdout:
-            print("STDOUT:", e.stdout)
-        if e.stderr:
-            print("STDERR:", e.stderr)
         return False
+    
+    if proc.returncode != 0:
+        print(f"❌ Error: Command '{' '.join(cmd)}' returned non-zero exit status {proc.returncode}")
+        if recent_lines:
+            print(f"OUTPUT (last {len(recent_lines)} lines):")
+            sys.stdout.write("".join(recent_lines))
+        return False
+    return True
 
 
-def check_docker_compose():
-    """Check if Docker Compose services are running and healthy."""
+def _run_suite_command(cmd: List[str], env: dict, timeout: int) -> subprocess.CompletedProcess:
+    """Run one pytest suite, capturing its output if this thread is buffered."""
+    if isinstance(sys.stdout, _SuiteOutput) and sys.stdout.capturing:
+        try:
+            result = subprocess.run(cmd, env=env, timeout=timeout, text=True,
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except subprocess.TimeoutExpired as e:
+            output = e.output or ""
+            sys.stdout.write(output if isinstance(output, str) else output.decode(errors="replace"))
+            raise
+        sys.stdout.write(result.stdout)
+        return result
+    return subprocess.run(cmd, env=env, timeout=timeout)
+
+
+def _run_buffered(output: _SuiteOutput, suite, **kwargs):
+    """Run ``suite(**kwargs)`` with its output held back; returns (result, output)."""
+    output.capture()
+    try:
+        return suite(**kwargs), output.release()
+    except BaseException:
+        output.stream.write(output.release())
+        raise
+
+
+def _test_env() -> dict:
+    """Return the pytest environment, with the project root on PYTHONPATH."""
+    global _BASE_ENV
+    if _BASE_ENV is None:
+        _BASE_ENV = os.environ.copy()
+        # Set PYTHONPATH to include current directory for proper imports
+        _BASE_ENV["PYTHONPATH"] = str(_CWD) + ":" + _BASE_ENV.get("PYTHONPATH", "")
+        # Fixed hash seed and unbuffered output for every pytest process; the
+        # runner has already synced dependencies, so `uv run` can skip its own
+        # lockfile check. Bytecode writes stay on: uv does not precompile
+        # site-packages, so suppressing them would recompile every import
+        # on every run.
+        _BASE_ENV.setdefault("PYTHONHASHSEED", "0")
+        _BASE_ENV["PYTHONUNBUFFERED"] = "1"
+        _BASE_ENV["UV_NO_SYNC"] = "1"
+    return _BASE_ENV
+
+
+def _pytest_options(with_coverage: bool):
+    """Return the coverage flags and environment for one pytest invocation."""
+    if not with_coverage:
+        return ["--no-cov"], _test_env()
+    # sys.monitoring-based tracing (Python 3.12+) costs far less than settrace
+    return COVERAGE_ARGS, {**_test_env(), "COVERAGE_CORE": "sysmon"}
+
+
+def dependency_fingerprint() -> str:
+    """Hash the dependency manifests that drive `uv sync`."""
+    digest = hashlib.blake2b()
+    for manifest in ("uv.lock", "pyproject.toml"):
+        digest.update(Path(manifest).read_bytes())
+    return digest.hexdigest()
+
+
+def sync_dev_dependencies() -> bool:
+    """Install dev dependencies, skipping `uv sync` when the lockfile is unchanged."""
+    fingerprint = dependency_fingerprint()
+    if (Path(".venv").exists() and UV_SYNC_STAMP.exists()
+            and UV_SYNC_STAMP.read_text().strip() == fingerprint):
+        print("✅ Dev dependencies up to date (uv.lock unchanged)")
+        return True
+    
+    if not run_command(["uv", "sync", "--dev"], "Installing dev dependencies"):
+        return False
+    
+    CACHE_DIR.mkdir(exist_ok=True)
+    UV_SYNC_STAMP.write_text(fingerprint)
+    return True
+
+
+async def _compose_ps():
+    """Return the Docker Compose containers as parsed `docker compose ps` rows."""
+    import asyncio
     try:
         # Check running containers with health status
-        result = subprocess.run(["docker", "compose", "ps", "--format", "json"], 
-                              capture_output=True, text=True, timeout=15)
+        proc = await asyncio.create_subprocess_exec(
+            "docker", "compose", "ps", "--format", COMPOSE_PS_FORMAT,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=15)
+        except asyncio.TimeoutError:
+            proc.kill()
+            raise
         
-        if result.returncode != 0:
-            print(f"   Docker compose ps failed: {result.stderr}")
-            return False, {}
+        if proc.returncode != 0:
+            print(f"   Docker compose ps failed: {stderr.decode()}")
+            return []
         
-        if not result.stdout.strip():
+        output = stdout.decode()
+        if not output.strip():
             print("   No Docker Compose containers found")
-            return False, {}
+            return []
             
-        # Parse JSON output to check for running services
-        import json
+        # One "service|state|health" row per container
         containers = []
-        for line in result.stdout.strip().split('\n'):
-            if line.strip():
-                try:
-                    containers.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-        
-        running_services = [c['Service'] for c in containers if c.get('State') == 'running']
-        health_status = {c['Service']: c.get('Health', 'unknown') for c in containers}
-        
-        print(f"   Found running services: {running_services}")
-        if health_status:
-            print(f"   Health status: {health_status}")
-        
-        # Check if required services are running
-        services_running = 'db' in running_services and 'backend' in running_services
-        
-        # Check health status if available
-        db_healthy = health_status.get('db', 'unknown') in ['healthy', 'unknown']
-        backend_healthy = health_status.get('backend', 'unknown') in ['healthy', 'unknown']
-        
-        return services_running and db_healthy and backend_healthy, health_status
+        for line in output.strip().split('\n'):
+            fields = line.strip().split('|', len(COMPOSE_PS_FIELDS) - 1)
+            if len(fields) == len(COMPOSE_PS_FIELDS):
+                containers.append(dict(zip(COMPOSE_PS_FIELDS, fields)))
+        return containers
         
     except Exception as e:
         print(f"   Docker compose check failed: {e}")
+        return []
+
+
+def _summarize_services(containers):
+    """Report whether the db and backend services are running and healthy."""
+    if not containers:
         return False, {}
+    
+    running_services = [c['Service'] for c in containers if c.get('State') == 'running']
+    health_status = {c['Service']: c.get('Health', 'unknown') for c in containers}
+    
+    print(f"   Found running services: {running_services}")
+    if health_status:
+        print(f"   Health status: {health_status}")
+    
+    # Check if required services are running
+    services_running = 'db' in running_services and 'backend' in running_services
+    
+    # Check health status if available
+    db_healthy = health_status.get('db', 'unknown') in ['healthy', 'unknown']
+    backend_healthy = health_status.get('backend', 'unknown') in ['healthy', 'unknown']
+    
+    return services_running and db_healthy and backend_healthy, health_status
+
+
+async def check_docker_compose():
+    """Check if Docker Compose services are running and healthy."""
+    return _summarize_services(await _compose_ps())
 
 
-def check_postgresql():
+def docker_compose_status():
+    """Blocking wrapper around :func:`check_docker_compose`."""
+    import asyncio
+    return asyncio.run(check_docker_compose())
+
+
+def _probe_postgresql():
+    """Open a connection, run `SELECT 1` and close it again."""
+    import psycopg
+    with psycopg.connect(
+        host="localhost", 
+        port=5432, 
+        dbname="slashrun", 
+        user="postgres", 
+        password="postgres",
+        connect_timeout=2,
+        autocommit=True
+    ) as conn:
+        conn.execute("SELECT 1")
+
+
+async def check_postgresql():
     """Check if PostgreSQL is accessible."""
+    import asyncio
     try:
-        import psycopg
-        conn = psycopg.connect(
-            host="localhost", 
-            port=5432, 
-            dbname="slashrun", 
-            user="postgres", 
-            password="postgres",
-            connect_timeout=5
-        )
-        conn.close()
+        await asyncio.to_thread(_probe_postgresql)
         print("   ✅ PostgreSQL connection successful")
         return True
     except ImportError:
@@ -105,15 +301,29 @@ def check_postgresql():
         return False
 
 
-def check_api_server():
+def _get_health_status() -> int:
+    """GET /health on a fresh connection and return the status code."""
+    import http.client
+    conn = http.client.HTTPConnection("localhost", 8000, timeout=2)
+    try:
+        conn.request("GET", "/health")
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    finally:
+        conn.close()
+
+
+async def check_api_server():
     """Check if API server is responding."""
+    import asyncio
     try:
-        response = requests.get("http://localhost:8000/health", timeout=5)
-        if response.status_code == 200:
+        status = await asyncio.to_thread(_get_health_status)
+        if status == 200:
             print("   ✅ API server responding")
             return True
         else:
-            print(f"   ❌ API server returned {response.status_code}")
+            print(f"   ❌ API server returned {status}")
             return False
     except Exception as e:
         print(f"   ❌ API server connection failed: {e}")
@@ -121,19 +331,19 @@ def check_api_server():
 
 
 def start_docker_services():
-    """Start Docker Compose services."""
-    print("🚀 Starting Docker Compose services...")
+    """Start Docker Compose services and block until their healthchecks pass."""
+    print("🚀 Starting Docker Compose services (waiting for healthchecks)...")
     try:
-        result = subprocess.run(["docker", "compose", "up", "-d"], 
-                              capture_output=True, text=True, timeout=120)
+        # --wait returns as soon as every service reports healthy instead of
+        # sleeping for a fixed interval
+        result = subprocess.run(["docker", "compose", "up", "-d", "--wait", "--wait-timeout", "120"], 
+                              capture_output=True, text=True, timeout=180)
         
         if result.returncode != 0:
             print(f"❌ Failed to start services: {result.stderr}")
             return False
             
-        print("✅ Docker Compose services started")
-        print("⏳ Waiting for services to be ready...")
-        time.sleep(10)
+        print("✅ Docker Compose services started and healthy")
         return True
         
     except Exception as e:
@@ -141,84 +351,440 @@ def start_docker_services():
         return False
 
 
-def run_integration_tests():
-    """Run integration tests against Docker Compose services."""
+async def _probe_services():
+    import asyncio
+    postgresql_ready, api_ready = await asyncio.gather(check_postgresql(), check_api_server())
+    return postgresql_ready and api_ready
+
+
+def verify_services() -> bool:
+    """Confirm PostgreSQL and the API are reachable from the host.
+    
+    Readiness itself comes from the compose healthchecks (`docker compose up
+    --wait`); this single probe only checks the published ports.
+    """
+    import asyncio
+    print("🔌 Checking PostgreSQL and API connectivity...")
+    ready = asyncio.run(_probe_services())
+    if ready:
+        print("✅ All services are ready and healthy!")
+    return ready
+
+
+def _hash_tree(path: str) -> int:
+    """XOR of per-file blake2b digests under ``path`` (order-independent)."""
+    state = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name != "__pycache__":
+                    state ^= _hash_tree(entry.path)
+            elif entry.is_file() and not entry.name.endswith(".pyc"):
+                with open(entry.path, "rb") as f:
+                    # The path is hashed too so renames and moves invalidate
+                    digest = hashlib.blake2b(entry.path.encode(), digest_size=8)
+                    digest.update(f.read())
+                state ^= int.from_bytes(digest.digest(), "big")
+    return state
+
+
+def _hash_file(path: str) -> int:
+    digest = hashlib.blake2b(path.encode(), digest_size=8)
+    digest.update(Path(path).read_bytes())
+    return int.from_bytes(digest.digest(), "big")
+
+
+def _suite_hash() -> str:
+    """Fingerprint the code under test, the tests and the dependency manifests."""
+    state = 0
+    for source in SUITE_SOURCES:
+        if "*" in source:
+            for path in Path().glob(source):
+                state ^= _hash_file(str(path))
+        elif os.path.isdir(source):
+            state ^= _hash_tree(source)
+        else:
+            state ^= _hash_file(source)
+    return f"{state:016x}"
+
+
+def _pass_marker(suite_hash: str) -> Path:
+    return CACHE_DIR / f"tests-pass-{suite_hash}.ok"
+
+
+def run_file_tests(test_files: List[str], extra_args: List[str]) -> bool:
+    """Run each of ``test_files`` in its own pytest process, in parallel.
+    
+    A file is never split across processes, so its module- and
+    session-scoped fixtures are built once and the interpreter, plugin and
+    app imports are paid once per file. With several files, each one's
+    output is held back and printed as one block, in file order.
+    """
+    import tempfile
+    env = _test_env()
+    # Parallel files would race on the same .coverage file, so coverage stays off here
+    commands = [["uv", "run", "pytest", "-v", "--tb=short", "--no-cov", *extra_args, path] for path in test_files]
+    if len(commands) == 1:
+        returncodes = [subprocess.run(commands[0], env=env).returncode]
+    else:
+        print(f"🚀 Running {len(test_files)} test files in parallel...")
+        sys.stdout.flush()
+        # Temp files rather than pipes: a process blocked on a full pipe
+        # would stall while an earlier file is still being waited on
+        outputs = [tempfile.TemporaryFile() for _ in commands]
+        procs = [
+            subprocess.Popen(cmd, env=env, stdout=output, stderr=subprocess.STDOUT)
+            for cmd, output in zip(commands, outputs)
+        ]
+        returncodes = []
+        for path, proc, output in zip(test_files, procs, outputs):
+            with output:
+                returncodes.append(proc.wait())
+                output.seek(0)
+                print(f"\n📄 {path} output:")
+                sys.stdout.write(output.read().decode(errors="replace"))
+                sys.stdout.flush()
+    
+    # Exit code 5 means nothing was collected in that file (e.g. all
+    # deselected by -m); the run still needs at least one file that ran tests
+    return all(code in (0, 5) for code in returncodes) and 0 in returncodes
+
+
+def _daemon_key() -> str:
+    """Identify the daemon build: dependencies plus this runner's own source."""
+    digest = hashlib.blake2b(dependency_fingerprint().encode(), digest_size=16)
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def _send_request(sock, request: dict, fds: List[int]):
+    """Send one newline-terminated JSON request, passing ``fds`` along with it."""
+    import json
+    import socket
+    payload = json.dumps(request).encode() + b"\n"
+    # The descriptors travel with the first chunk; a stream socket may take
+    # the rest of a large request in later writes
+    sent = socket.send_fds(sock, [payload], fds)
+    sock.sendall(payload[sent:])
+
+
+def _recv_request(conn) -> tuple:
+    """Read one request sent by :func:`_send_request`; returns (request, fds).
+    
+    Reads until the terminating newline, however the stream splits the
+    message. Raises ValueError for a truncated or malformed request, after
+    closing any descriptors that came with it.
+    """
+    import json
+    import socket
+    data, fds, _, _ = socket.recv_fds(conn, 1 << 16, 3)
+    chunks = [data]
+    try:
+        while not chunks[-1].endswith(b"\n"):
+            chunk = conn.recv(1 << 16)
+            if not chunk:
+                raise ValueError("connection closed before the request was complete")
+            chunks.append(chunk)
+        return json.loads(b"".join(chunks)), fds
+    except BaseException:
+        for fd in fds:
+            os.close(fd)
+        raise
+
+
+def _run_forked(conn, request: dict, fds: List[int]):
+    """Body of one forked daemon child: run pytest on the client's terminal."""
+    import json
+    import signal
+    import pytest
+    # Undo the daemon's handlers: tests must be able to wait on their own
+    # children, and a plain SIGTERM should end this run
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    returncode = 1
+    try:
+        for target, fd in zip((0, 1, 2), fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.argv = ["pytest", *request["args"]]
+        returncode = int(pytest.main(request["args"]))
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        conn.sendall(json.dumps({"returncode": returncode}).encode() + b"\n")
+        os._exit(returncode)
+
+
+def serve_pytest_daemon(key: str):
+    """Serve pytest runs over a Unix socket from a pre-warmed interpreter.
+    
+    Each request carries the client's stdio file descriptors and is run in a
+    forked child, so pytest, its plugins and the heavy dependencies are
+    imported once while every run still starts from a clean process. The
+    daemon exits when a client presents a different ``key``.
+    """
+    import importlib
+    import signal
+    import socket
+    for name in DAEMON_PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    # `kill` should still remove the socket and pid file on the way out
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    
+    DAEMON_SOCKET.unlink(missing_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(DAEMON_SOCKET))
+    server.listen()
+    socket_inode = DAEMON_SOCKET.stat().st_ino
+    DAEMON_PID.write_text(str(os.getpid()))
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    request, fds = _recv_request(conn)
+                except (OSError, ValueError) as e:
+                    print(f"Dropped request: {e}", flush=True)
+                    continue
+                try:
+                    if request.get("key") != key:
+                        conn.sendall(b'{"stale": true}\n')
+                        break
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    if os.fork() == 0:
+                        _run_forked(conn, request, fds)
+                finally:
+                    for fd in fds:
+                        os.close(fd)
+    finally:
+        server.close()
+        # A replacement daemon may already own the path; only remove our own
+        try:
+            if DAEMON_SOCKET.stat().st_ino == socket_inode:
+                DAEMON_SOCKET.unlink()
+        except OSError:
+            pass
+        if DAEMON_PID.exists() and DAEMON_PID.read_text() == str(os.getpid()):
+            DAEMON_PID.unlink()
+
+
+def _start_pytest_daemon(key: str) -> bool:
+    """Launch the daemon in the background and wait for its socket."""
+    import time
+    print("🔥 Starting pytest daemon (first run pays the import cost)...")
+    CACHE_DIR.mkdir(exist_ok=True)
+    # Nothing is listening (or it is about to exit as stale): clear the path
+    DAEMON_SOCKET.unlink(missing_ok=True)
+    with open(DAEMON_LOG, "ab") as log:
+        proc = subprocess.Popen(
+            ["uv", "run", "python", "-c", f"import run_tests; run_tests.serve_pytest_daemon({key!r})"],
+            cwd=_CWD, env=_test_env(), stdin=subprocess.DEVNULL,
+            stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+        )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if DAEMON_SOCKET.exists():
+            return True
+        if proc.poll() is not None:
+            break
+        time.sleep(0.05)
+    print(f"   ⚠️  pytest daemon did not come up (see {DAEMON_LOG})")
+    return False
+
+
+def _daemon_request(key: str, args: List[str]) -> Optional[dict]:
+    """Send one run to the daemon, sharing this process's stdio with it.
+    
+    Returns None when no daemon accepts the connection, and an empty dict
+    when the run was handed over but no status came back (the forked run
+    crashed or was killed).
+    """
+    import json
+    import socket
+    request = {"key": key, "cwd": str(_CWD), "args": args, "env": _test_env()}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(DAEMON_SOCKET))
+        except OSError:
+            return None
+        try:
+            _send_request(client, request, [0, 1, 2])
+            reply = client.makefile("rb").readline()
+            return json.loads(reply)
+        except (OSError, ValueError):
+            return {}
+
+
+def run_daemon_tests(test_files: List[str], extra_args: List[str]) -> bool:
+    """Run the selected files through the pytest daemon.
+    
+    Falls back to :func:`run_file_tests` when the daemon cannot be
+    reached or started. A run the daemon accepted but never reported on
+    counts as failed; the daemon is left running and nothing is rerun.
+    """
+    key = _daemon_key()
+    args = ["-v", "--tb=short", "--no-cov", *extra_args, *test_files]
+    for attempt in range(2):
+        status = _daemon_request(key, args)
+        if status is not None and "returncode" in status:
+            return status["returncode"] == 0
+        if status is not None and not status.get("stale"):
+            print("❌ pytest run ended without reporting a result (crashed or killed)")
+            return False
+        # No daemon yet, a dead one, or one built from other sources
+        if attempt or not _start_pytest_daemon(key):
+            break
+    print("   ⚠️  pytest daemon unavailable, running tests directly")
+    return run_file_tests(test_files, extra_args)
+
+
+def print_usage():
+    """Show runner usage information."""
+    print("\n📊 Usage:")
+    print("   • Unit tests only:        python run_tests.py unit")
+    print("   • Integration tests only: python run_tests.py integration")
+    print("   • Both test types:        python run_tests.py all")
+    print("   • Specific test files:    python run_tests.py core|api|database")
+    print("   • With coverage:          python run_tests.py coverage")
+    print("   • Fast tests only:        python run_tests.py fast")
+    print("   • Ignore cached results:  python run_tests.py unit --no-cache")
+    print("   • Warm pytest daemon:     python run_tests.py core --daemon")
+    print("   • Plain pytest + coverage, no Docker: python run_tests.py --simple  (or ./run_tests.sh)")
+    print("\n📋 Scenario Testing (dedicated framework):")
+    print("   • cd scenarios && uv run python runner.py --all")
+    print("   • cd scenarios && uv run python analyzer.py")
+
+
+def exec_tests(cmd: List[str], env: Optional[dict] = None):
+    """Replace the runner process with the final pytest invocation.
+    
+    Used when pytest is the last thing the runner does, so no parent
+    interpreter has to wait around just to relay the exit code.
+    """
+    print_usage()
+    print(f"\n🚀 Handing off to: {' '.join(cmd)}")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvpe(cmd[0], cmd, env if env is not None else os.environ)
+
+
+def run_integration_tests(final: bool = False):
+    """Run integration tests against Docker Compose services.
+    
+    With ``final=True`` the runner process is replaced by pytest.
+    """
     print("🧪 Running integration tests (PostgreSQL + HTTP)...")
     print("=" * 50)
     
     # Check if services are running
-    services_ready, health_status = check_docker_compose()
+    services_ready, health_status = docker_compose_status()
     if not services_ready:
-        print("⚠️  Services not running, attempting to start...")
+        # `up --wait` is idempotent: it starts what is missing and blocks on
+        # the compose healthchecks for containers that are still starting
+        print("⚠️  Services not running or not yet healthy, starting/waiting...")
         if not start_docker_services():
             print("❌ Could not start Docker Compose services")
+            print("💡 Try running: docker-compose logs backend")
             return False
     
-    # Wait for services to be ready with improved monitoring
-    max_attempts = 45  # Increased from 30 to allow more startup time
-    print("⏳ Waiting for services to be healthy...")
-    
-    for attempt in range(max_attempts):
-        services_ready, health_status = check_docker_compose()
-        postgresql_ready = check_postgresql()
-        api_ready = check_api_server()
-        
-        if services_ready and postgresql_ready and api_ready:
-            print("✅ All services are ready and healthy!")
-            break
-        
-        if attempt < max_attempts - 1:
-            print(f"   Waiting for services... ({attempt + 1}/{max_attempts})")
-            if health_status:
-                unhealthy = [svc for svc, status in health_status.items() if status not in ['healthy', 'unknown']]
-                if unhealthy:
-                    print(f"   Unhealthy services: {unhealthy}")
-            time.sleep(3)  # Increased from 2 seconds
-    else:
-        print("❌ Services not ready after waiting")
+    if not verify_services():
+        print("❌ Services not reachable from the host")
         print("💡 Try running: docker-compose logs backend")
         return False
     
-    # Set PYTHONPATH to include current directory for proper imports
-    env = os.environ.copy()
-    env["PYTHONPATH"] = str(Path.cwd()) + ":" + env.get("PYTHONPATH", "")
+    env = _test_env()
     
-    # Run integration tests
-    cmd = ["uv", "run", "pytest", "backend/tests/test_api_integration.py", "-v", "--tb=short"]
+    # Run integration tests (the code under test runs in the backend
+    # container, so local coverage would measure nothing)
+    cmd = ["uv", "run", "pytest", "backend/tests/test_api_integration.py", "-v", "--tb=short", "--no-cov"]
+    if final:
+        exec_tests(cmd, env)
     
     try:
-        result = subprocess.run(cmd, env=env, timeout=300)  # 5 minute timeout
+        result = _run_suite_command(cmd, env, timeout=300)  # 5 minute timeout
         return result.returncode == 0
     except subprocess.TimeoutExpired:
         print("❌ Integration tests timed out")
         return False
 
 
-def run_unit_tests():
-    """Run unit tests with SQLite in-memory database."""
+def run_simple_tests(extra_args: List[str], final: bool = False):
+    """Run one plain pytest over backend/tests without any Docker handling.
+    
+    This is the behaviour of ``run_tests.sh``, which now delegates here:
+    coverage is collected through pyproject's addopts, as the script's bare
+    ``pytest`` run did. Integration tests skip themselves when Docker
+    Compose is not running. Exits with pytest's status.
+    """
+    print("🧪 Running pytest test suite (no Docker service management)...")
+    print("=" * 50)
+    
+    # addopts already carries the coverage flags; only the tracer is chosen here
+    _, env = _pytest_options(with_coverage=True)
+    cmd = ["uv", "run", "pytest", *(extra_args or ["backend/tests/"]), "-v"]
+    if final:
+        exec_tests(cmd, env)
+    sys.exit(subprocess.run(cmd, env=env).returncode)
+
+
+def run_unit_tests(final: bool = False, use_cache: bool = True, with_coverage: bool = False):
+    """Run unit tests with SQLite in-memory database.
+    
+    Coverage is only collected with ``with_coverage=True``. A green run is
+    recorded against a hash of the sources, and an identical tree is
+    skipped on the next run. With ``final=True`` the runner process
+    is replaced by pytest, which only happens when the cache is disabled
+    since nothing would be left to record the result.
+    """
     print("🧪 Running unit tests (SQLite in-memory)...")
     print("=" * 50)
     
-    # Set PYTHONPATH to include current directory for proper imports
-    env = os.environ.copy()
-    env["PYTHONPATH"] = str(Path.cwd()) + ":" + env.get("PYTHONPATH", "")
+    if use_cache:
+        marker = _pass_marker(_suite_hash())
+        # A coverage run has to execute to produce its report
+        if marker.exists() and not with_coverage:
+            print(f"✅ Cache hit: sources unchanged since last green run ({marker})")
+            return True
+    
+    coverage_args, env = _pytest_options(with_coverage)
     
     cmd = [
         "uv", "run", "pytest",
         "backend/tests/",
         "--ignore=backend/tests/test_api_integration.py",  # Exclude integration tests
         "-v", "--tb=short",
-        "--cov=backend/app",
-        "--cov-report=html:coverage_html",
-        "--cov-report=term-missing"
+        "--ff",  # Re-run last failures first (from .pytest_cache)
+        *coverage_args
     ]
+    if os.getenv("CI"):
+        # In CI a single failure already fails the job, so stop there
+        cmd.append("-x")
+    if final and not use_cache:
+        exec_tests(cmd, env)
     
     try:
-        result = subprocess.run(cmd, env=env, timeout=180)
-        return result.returncode == 0
+        result = _run_suite_command(cmd, env, timeout=180)
     except subprocess.TimeoutExpired:
         print("❌ Unit tests timed out")
         return False
+    
+    if result.returncode != 0:
+        return False
+    if use_cache:
+        # Drop markers for older trees so .cache does not grow without bound
+        for stale in CACHE_DIR.glob("tests-pass-*.ok"):
+            stale.unlink()
+        CACHE_DIR.mkdir(exist_ok=True)
+        marker.touch()
+    return True
 
 
 def main():
@@ -233,13 +799,18 @@ def main():
         sys.exit(1)
     
     # Install dev dependencies
-    if not run_command(["uv", "sync", "--dev"], "Installing dev dependencies"):
+    if not sync_dev_dependencies():
         sys.exit(1)
     
     # Parse command line arguments
     run_integration = False
     run_units = True  # Default to unit tests
     test_args = []
+    selected_files = []
+    with_coverage = False
+    use_cache = True
+    simple = False
+    use_daemon = False
     
     if len(sys.argv) > 1:
         for arg in sys.argv[1:]:
@@ -252,37 +823,92 @@ def main():
             elif arg == "all":
                 run_units = True
                 run_integration = True
-            elif arg == "core":
-                test_args.extend(["backend/tests/test_simulation_core.py", "-v"])
-                run_units = True
-                run_integration = False
-            elif arg == "api":
-                test_args.extend(["backend/tests/test_api.py", "-v"])
-                run_units = True
-                run_integration = False
-            elif arg == "database":
-                test_args.extend(["backend/tests/test_database.py", "-v"])
+            elif arg in TEST_FILES:
+                if TEST_FILES[arg] not in selected_files:
+                    selected_files.append(TEST_FILES[arg])
                 run_units = True
                 run_integration = False
             elif arg == "coverage":
-                test_args.extend(["--cov=backend/app", "--cov-report=html"])
+                with_coverage = True
             elif arg == "fast":
                 test_args.extend(["-m", "not slow"])
+            elif arg == "--no-cache":
+                use_cache = False
+            elif arg == "--simple":
+                simple = True
+            elif arg == "--daemon":
+                use_daemon = os.name == "posix"
             else:
                 test_args.append(arg)
     
+    # A single remaining suite is exec'd so pytest replaces this process;
+    # running both suites keeps the parent alive to combine their results
+    exec_final = os.name == "posix"
+    
+    if simple:
+        run_simple_tests(selected_files + test_args, final=exec_final)
+    
     success = True
     
+    # Unit tests (SQLite in-memory) and integration tests (Dockerized PostgreSQL)
+    # share no state, so when services are already healthy run the full unit
+    # suite and the integration suite side by side. Each suite's output is
+    # held back and printed in one piece when that suite finishes.
+    if (run_units and run_integration and not test_args and not selected_files
+            and docker_compose_status()[0]):
+        print("🚀 Services already healthy - running unit and integration tests concurrently...")
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        stdout = sys.stdout
+        stdout.flush()
+        output = _SuiteOutput(stdout)
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = {
+                    executor.submit(_run_buffered, output, run_unit_tests,
+                                    use_cache=use_cache, with_coverage=with_coverage): "Unit",
+                    executor.submit(_run_buffered, output, run_integration_tests): "Integration",
+                }
+                for future in as_completed(futures):
+                    suite = futures[future]
+                    passed, suite_output = future.result()
+                    print(f"\n📄 {suite} tests output:")
+                    sys.stdout.write(suite_output)
+                    if passed:
+                        print(f"✅ {suite} tests passed!")
+                    else:
+                        print(f"❌ {suite} tests failed!")
+                        success = False
+                    sys.stdout.flush()
+        finally:
+            sys.stdout = stdout
+        run_units = run_integration = False
+    
     # Run unit tests
-    if run_units:
+    if run_units and selected_files and not with_coverage and use_daemon:
+        # Specific test files through the warm pytest daemon
+        success = run_daemon_tests(selected_files, test_args)
+    elif run_units and selected_files and not with_coverage:
+        # Specific test files: one pytest process per file
+        success = run_file_tests(selected_files, test_args)
+    elif run_units:
+        if selected_files:
+            test_args = [arg for path in selected_files for arg in (path, "-v")] + test_args
         if test_args:
             # Run specific unit tests
-            cmd = ["uv", "run", "pytest"] + test_args
+            coverage_args, env = _pytest_options(with_coverage)
+            cmd = ["uv", "run", "pytest"] + test_args + coverage_args
             print(f"🚀 Running specific tests: {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=False)
+            if exec_final and not run_integration:
+                exec_tests(cmd, env)
+            result = subprocess.run(cmd, check=False, env=env)
             success = result.returncode == 0
         else:
-            success = run_unit_tests()
+            success = run_unit_tests(
+                final=exec_final and not run_integration,
+                use_cache=use_cache,
+                with_coverage=with_coverage
+            )
             if success:
                 print("✅ Unit tests passed!")
             else:
@@ -290,7 +916,7 @@ def main():
     
     # Run integration tests
     if run_integration and success:  # Only run if unit tests passed
-        integration_success = run_integration_tests()
+        integration_success = run_integration_tests(final=exec_final)
         if integration_success:
             print("✅ Integration tests passed!")
         else:
@@ -305,18 +931,9 @@ def main():
         print("❌ Some tests failed!")
     
     # Show usage info
-    print("\n📊 Usage:")
-    print("   • Unit tests only:        python run_tests.py unit")
-    print("   • Integration tests only: python run_tests.py integration")
-    print("   • Both test types:        python run_tests.py all")
-    print("   • Specific test files:    python run_tests.py core|api|database")
-    print("   • With coverage:          python run_tests.py coverage")
-    print("   • Fast tests only:        python run_tests.py fast")
-    print("\n📋 Scenario Testing (dedicated framework):")
-    print("   • cd scenarios && uv run python runner.py --all")
-    print("   • cd scenarios && uv run python analyzer.py")
+    print_usage()
     
-    if Path("coverage_html/index.html").exists():
+    if with_coverage and Path("coverage_html/index.html").exists():
         print("\n📈 Coverage report: coverage_html/index.html")
     
     sys.exit(0 if success else 1)
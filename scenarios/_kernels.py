@@ -0,0 +1,124 @@
+"""
+Numeric kernels for scenario analysis and validation.
+Compiled with Numba when it is installed; otherwise equivalent NumPy versions are used.
+"""
+
+import numpy as np
+
+# Optional JIT compiler
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# A change is "rapid" above this relative move, or above this absolute move
+# when the old value was zero
+RAPID_CHANGE_THRESHOLD = 0.1
+ZERO_BASE_THRESHOLD = 0.01
+
+
+def _timing_stats_numpy(old: np.ndarray, new: np.ndarray,
+                        threshold: float = RAPID_CHANGE_THRESHOLD) -> tuple:
+    """Count rapid changes among ``old -> new`` pairs; returns (rapid, total)."""
+    nonzero = old != 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.abs((new - old) / np.where(nonzero, old, 1.0))
+    rapid = np.where(nonzero, relative > threshold, np.abs(new) > ZERO_BASE_THRESHOLD)
+    return int(rapid.sum()), int(old.size)
+
+
+def _mean_abs_diff_numpy(values: np.ndarray) -> float:
+    """Mean absolute step-to-step change of a series with at least two points."""
+    return float(np.abs(np.diff(values)).mean())
+
+
+def _extreme_indices_numpy(values: np.ndarray) -> tuple:
+    """Indices of the first minimum and first maximum of a non-empty series."""
+    return int(values.argmin()), int(values.argmax())
+
+
+def _exceeds_baseline_numpy(values: np.ndarray, groups: np.ndarray, factor: float) -> bool:
+    """Whether any value exceeds ``factor`` times the first value of its group.
+    
+    ``groups`` numbers the groups 0..n-1 in order of first appearance.
+    """
+    _, first = np.unique(groups, return_index=True)
+    return bool((values > values[first][groups] * factor).any())
+
+
+if HAS_NUMBA:
+    # No fastmath: it would let the compiler drop the NaN semantics the
+    # comparisons rely on
+    @njit(cache=True)
+    def _timing_stats_jit(old, new, threshold):
+        # Written as selects rather than nested ifs so LLVM can if-convert
+        # and vectorize the loop, mirroring the masks of the NumPy version
+        rapid = 0
+        for i in range(old.size):
+            ov = old[i]
+            nv = new[i]
+            nonzero = ov != 0.0
+            relative = abs((nv - ov) / (ov if nonzero else 1.0))
+            rapid += (relative > threshold) if nonzero else (abs(nv) > ZERO_BASE_THRESHOLD)
+        return rapid, old.size
+
+    @njit(cache=True)
+    def _mean_abs_diff_jit(values):
+        total = 0.0
+        for i in range(1, values.size):
+            total += abs(values[i] - values[i - 1])
+        return total / (values.size - 1)
+
+    @njit(cache=True)
+    def _extreme_indices_jit(values):
+        imin = 0
+        imax = 0
+        for i in range(1, values.size):
+            v = values[i]
+            if v < values[imin]:
+                imin = i
+            if v > values[imax]:
+                imax = i
+        return imin, imax
+
+    @njit(cache=True)
+    def _exceeds_baseline_jit(values, groups, factor):
+        # Stops at the first value over its group's baseline
+        baselines = np.empty(groups.max() + 1)
+        seen = np.zeros(groups.max() + 1, dtype=np.bool_)
+        for i in range(values.size):
+            g = groups[i]
+            if not seen[g]:
+                seen[g] = True
+                baselines[g] = values[i]
+            if values[i] > baselines[g] * factor:
+                return True
+        return False
+
+    def timing_stats(old: np.ndarray, new: np.ndarray,
+                     threshold: float = RAPID_CHANGE_THRESHOLD) -> tuple:
+        """Count rapid changes among ``old -> new`` pairs; returns (rapid, total)."""
+        rapid, total = _timing_stats_jit(old, new, threshold)
+        return int(rapid), int(total)
+
+    def mean_abs_diff(values: np.ndarray) -> float:
+        """Mean absolute step-to-step change of a series with at least two points."""
+        return float(_mean_abs_diff_jit(values))
+
+    def extreme_indices(values: np.ndarray) -> tuple:
+        """Indices of the first minimum and first maximum of a non-empty series."""
+        imin, imax = _extreme_indices_jit(values)
+        return int(imin), int(imax)
+
+    def exceeds_baseline(values: np.ndarray, groups: np.ndarray, factor: float) -> bool:
+        """Whether any value exceeds ``factor`` times the first value of its group.
+        
+        ``groups`` numbers the groups 0..n-1 in order of first appearance.
+        """
+        return bool(_exceeds_baseline_jit(values, groups, factor))
+else:
+    timing_stats = _timing_stats_numpy
+    mean_abs_diff = _mean_abs_diff_numpy
+    extreme_indices = _extreme_indices_numpy
+    exceeds_baseline = _exceeds_baseline_numpy
@@ -0,0 +1,380 @@
+"""
+Economic validators and audit-trail field extraction for the scenario runner.
+Fully annotated and clean under ``mypy --strict`` so the module can be
+compiled with mypyc; a compiled build placed next to this file is imported in
+place of the source.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from _kernels import exceeds_baseline, extreme_indices
+
+# Series at least this long are reduced with the compiled kernels; shorter
+# ones stay in Python, where building the arrays would cost more than it saves
+KERNEL_MIN_LENGTH = 64
+
+# (timestep, country code, value) row of a per-country series
+SeriesRow = Tuple[Any, str, float]
+
+
+def _series_range(values: List[float]) -> Optional[Tuple[float, float]]:
+    """(min, max) of a series, or None when it is empty."""
+    if not values:
+        return None
+    if len(values) < KERNEL_MIN_LENGTH:
+        return min(values), max(values)
+    imin, imax = extreme_indices(np.asarray(values, dtype=np.float64))
+    return values[imin], values[imax]
+
+
+def _extreme_rows(rows: List[SeriesRow]) -> Tuple[Optional[SeriesRow], Optional[SeriesRow]]:
+    """Rows with the smallest and largest value (third field), or (None, None)."""
+    if not rows:
+        return None, None
+    if len(rows) < KERNEL_MIN_LENGTH:
+        return min(rows, key=itemgetter(2)), max(rows, key=itemgetter(2))
+    imin, imax = extreme_indices(np.fromiter(map(itemgetter(2), rows), np.float64, len(rows)))
+    return rows[imin], rows[imax]
+
+
+def flatten(d: Dict[str, Any], prefix: str = "", out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Map every dotted key path of a nested dict to its value, inner dicts included."""
+    out = out if out is not None else {}
+    for key, value in d.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        out[path] = value
+        if isinstance(value, dict):
+            flatten(value, path, out)
+    return out
+
+
+@lru_cache(maxsize=None)
+def field_extractor(field_path: str) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a dotted field path into a lookup on one step's data.
+    
+    "audit.<name>" reads a key of the step audit; any other path walks the
+    state. Missing keys and non-dict intermediates give None.
+    """
+    if field_path.startswith("audit."):
+        audit_field = field_path[6:]  # Remove "audit."
+        
+        def extract_audit(step_data: Dict[str, Any]) -> Any:
+            try:
+                return step_data["audit"].get(audit_field)
+            except (KeyError, TypeError, AttributeError):
+                return None
+        
+        return extract_audit
+    
+    parts = tuple(field_path.split("."))
+    
+    def extract_state(step_data: Dict[str, Any]) -> Any:
+        # Only dicts have .get among parsed JSON values, so a missing key or
+        # a non-dict intermediate ends the walk with None
+        try:
+            current = step_data["state"]
+            for part in parts:
+                current = current.get(part)
+            return current
+        except (KeyError, TypeError, AttributeError):
+            return None
+    
+    return extract_state
+
+
+@dataclass
+class ValidationResult:
+    """Results from economic relationship validation."""
+    check_name: str
+    description: str
+    passed: bool
+    details: Dict[str, Any]
+    error_message: Optional[str] = None
+
+@dataclass
+class AuditIndex:
+    """What the validators read from an audit trail, accumulated step by step.
+    
+    ``observe`` folds in one step as it arrives, so a scenario can be
+    validated without keeping its whole trail. Only the last state, the
+    per-country series and the trajectories of ``field_paths`` are kept.
+    """
+    field_paths: Tuple[str, ...] = ()
+    steps: int = 0
+    last_state: Any = None  # state of the last step, as received
+    first_trigger_timestep: Optional[int] = None
+    trigger_fired: bool = False
+    us_tariffs: List[float] = field(default_factory=list)
+    chn_tariffs: List[float] = field(default_factory=list)
+    fx_rates: List[SeriesRow] = field(default_factory=list)  # (timestep, country, fx_rate), non-USD only
+    spreads: List[SeriesRow] = field(default_factory=list)  # (timestep, country, credit_spread)
+    field_values: Dict[str, List[Tuple[Any, Any]]] = field(default_factory=dict)  # path -> [(timestep, value)]
+    # (extractor, append to its field_values list) per tracked field path
+    _fields: List[Tuple[Callable[[Dict[str, Any]], Any], Callable[[Tuple[Any, Any]], None]]] = field(
+        default_factory=list, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        for field_path in self.field_paths:
+            values = self.field_values.setdefault(field_path, [])
+            self._fields.append((field_extractor(field_path), values.append))
+    
+    @classmethod
+    def from_audit_trail(cls, audit_trail: List[Dict[str, Any]], field_paths: Tuple[str, ...] = ()) -> "AuditIndex":
+        index = cls(field_paths=field_paths)
+        for step in audit_trail:
+            index.observe(step)
+        return index
+    
+    def observe(self, step: Dict[str, Any]) -> None:
+        """Fold one step of the trail into the index.
+        
+        Parts of the step that are missing or not shaped as expected are
+        skipped, so they only fail the checks that read them.
+        """
+        timestep = step.get("timestep")
+        state = step.get("state")
+        self.steps += 1
+        self.last_state = state
+        audit = step.get("audit")
+        if not self.trigger_fired and isinstance(audit, dict) and audit.get("triggers_fired"):
+            self.trigger_fired = True
+            self.first_trigger_timestep = timestep
+        
+        for extract, append in self._fields:
+            value = extract(step)
+            if value is not None:
+                append((timestep, value))
+        
+        countries = state.get("countries") if isinstance(state, dict) else None
+        if not isinstance(countries, dict):
+            return
+        for country_code, country_data in countries.items():
+            if not isinstance(country_data, dict):
+                continue
+            trade = country_data.get("trade")
+            if isinstance(trade, dict) and "tariff_mfn_avg" in trade:
+                if country_code == "USA":
+                    self.us_tariffs.append(trade["tariff_mfn_avg"])
+                elif country_code == "CHN":
+                    self.chn_tariffs.append(trade["tariff_mfn_avg"])
+            external = country_data.get("external")
+            if country_code != "USA" and isinstance(external, dict) and "fx_rate" in external:
+                self.fx_rates.append((timestep, country_code, external["fx_rate"]))
+            finance = country_data.get("finance")
+            if isinstance(finance, dict) and "credit_spread" in finance:
+                self.spreads.append((timestep, country_code, finance["credit_spread"]))
+
+
+class EconomicValidator:
+    """Validates economic relationships and realism."""
+    
+    def __init__(self) -> None:
+        self.tolerance = 0.001
+    
+    def validate_relationship(self, check_name: str, description: str, 
+                            audit_trail: Optional[List[Dict[str, Any]]], initial_state: Dict[str, Any],
+                            index: Optional[AuditIndex] = None,
+                            flat_initial: Optional[Dict[str, Any]] = None) -> ValidationResult:
+        """Validate a specific economic relationship.
+        
+        Checks read from ``index``; it is built from ``audit_trail`` when
+        omitted, so a streamed scenario passes only the index. Likewise
+        ``flat_initial`` is ``flatten(initial_state)``, computed if omitted.
+        """
+        handler = self._CHECKS.get(check_name)
+        if handler is None:
+            return ValidationResult(
+                check_name=check_name,
+                description=description,
+                passed=False,
+                details={},
+                error_message=f"Unknown validation check: {check_name}"
+            )
+        try:
+            if index is None:
+                if audit_trail is None:
+                    raise ValueError("either audit_trail or index is required")
+                index = AuditIndex.from_audit_trail(audit_trail)
+            if flat_initial is None:
+                flat_initial = flatten(initial_state)
+            return handler(self, index, flat_initial, description)
+        except Exception as e:
+            return ValidationResult(
+                check_name=check_name,
+                description=description, 
+                passed=False,
+                details={},
+                error_message=f"Validation error: {str(e)}"
+            )
+    
+    def _validate_taylor_rule_response(self, index: AuditIndex, flat_initial: Dict[str, Any]) -> ValidationResult:
+        """Validate that policy rate responds to inflation gap."""
+        if index.steps < 2:
+            return ValidationResult("policy_rate_adjusts_for_inflation", "Taylor rule response", False, 
+                                  {}, "Insufficient timesteps for validation")
+        
+        initial_inflation = flat_initial["countries.USA.macro.inflation"]
+        initial_rate = flat_initial["countries.USA.macro.policy_rate"]
+        target_inflation = flat_initial.get("countries.USA.macro.inflation_target", 0.02)
+        
+        final_state = index.last_state
+        final_inflation = final_state["countries"]["USA"]["macro"]["inflation"]
+        final_rate = final_state["countries"]["USA"]["macro"]["policy_rate"]
+        
+        initial_gap = initial_inflation - target_inflation
+        final_gap = final_inflation - target_inflation
+        
+        # Check if rate moved in correct direction
+        if initial_gap > 0:  # Above target inflation
+            rate_should_increase = final_rate > initial_rate - self.tolerance
+        else:  # Below target inflation
+            rate_should_increase = final_rate < initial_rate + self.tolerance
+        
+        return ValidationResult(
+            check_name="policy_rate_adjusts_for_inflation",
+            description="Taylor rule response",
+            passed=rate_should_increase,
+            details={
+                "initial_inflation": initial_inflation,
+                "final_inflation": final_inflation,
+                "initial_rate": initial_rate,
+                "final_rate": final_rate,
+                "initial_gap": initial_gap,
+                "final_gap": final_gap,
+                "target_inflation": target_inflation
+            }
+        )
+    
+    def _validate_inflation_evolution(self, index: AuditIndex, flat_initial: Dict[str, Any]) -> ValidationResult:
+        """Validate that inflation changes over time."""
+        if index.steps < 2:
+            return ValidationResult("inflation_changes_over_time", "Inflation evolution", False,
+                                  {}, "Insufficient timesteps for validation")
+        
+        initial_inflation = flat_initial["countries.USA.macro.inflation"]
+        final_inflation = index.last_state["countries"]["USA"]["macro"]["inflation"]
+        
+        changed = abs(final_inflation - initial_inflation) > self.tolerance
+        
+        return ValidationResult(
+            check_name="inflation_changes_over_time",
+            description="Inflation evolution",
+            passed=changed,
+            details={
+                "initial_inflation": initial_inflation,
+                "final_inflation": final_inflation,
+                "change": final_inflation - initial_inflation
+            }
+        )
+    
+    def _validate_trigger_timing(self, index: AuditIndex, description: str) -> ValidationResult:
+        """Validate that trigger fires at expected time."""
+        trigger_fired = index.trigger_fired
+        fire_timestep = index.first_trigger_timestep
+        
+        return ValidationResult(
+            check_name="trigger_fires_on_schedule",
+            description=description,
+            passed=trigger_fired,
+            details={
+                "trigger_fired": trigger_fired,
+                "fire_timestep": fire_timestep,
+                "expected_timestep": "varies by scenario"
+            }
+        )
+    
+    def _validate_tariff_escalation(self, index: AuditIndex) -> ValidationResult:
+        """Validate tariff escalation pattern."""
+        us_tariffs = index.us_tariffs
+        chn_tariffs = index.chn_tariffs
+        
+        us_range = _series_range(us_tariffs)
+        chn_range = _series_range(chn_tariffs)
+        us_escalated = us_range is not None and len(us_tariffs) > 1 and us_range[1] > us_range[0] + 0.1
+        chn_escalated = chn_range is not None and len(chn_tariffs) > 1 and chn_range[1] > chn_range[0] + 0.1
+        
+        return ValidationResult(
+            check_name="tariffs_increase_over_time",
+            description="Tariff escalation",
+            passed=us_escalated or chn_escalated,
+            details={
+                "us_tariff_range": us_range,
+                "chn_tariff_range": chn_range,
+                "us_escalated": us_escalated,
+                "chn_escalated": chn_escalated
+            }
+        )
+    
+    def _validate_currency_devaluation(self, index: AuditIndex) -> ValidationResult:
+        """Validate currency devaluation during crisis."""
+        fx_rates = index.fx_rates  # Non-USD currencies
+        
+        # Look for significant devaluation (FX rate increase for non-USD),
+        # each currency against its own first observed rate
+        if len(fx_rates) >= KERNEL_MIN_LENGTH:
+            codes: Dict[str, int] = {}
+            groups = np.fromiter(
+                (codes.setdefault(country_code, len(codes)) for _, country_code, _ in fx_rates),
+                np.intp, len(fx_rates)
+            )
+            values = np.fromiter(map(itemgetter(2), fx_rates), np.float64, len(fx_rates))
+            devaluation_found = exceeds_baseline(values, groups, 1.1)  # 10%+ devaluation
+        else:
+            devaluation_found = False
+            baselines: Dict[str, float] = {}
+            for _, country_code, fx_rate in fx_rates:
+                if fx_rate > baselines.setdefault(country_code, fx_rate) * 1.1:  # 10%+ devaluation
+                    devaluation_found = True
+                    break
+        
+        return ValidationResult(
+            check_name="fx_rate_increases_in_crisis",
+            description="Currency devaluation",
+            passed=devaluation_found,
+            details={
+                "fx_rate_series": fx_rates,
+                "devaluation_found": devaluation_found
+            }
+        )
+    
+    def _validate_credit_spread_widening(self, index: AuditIndex) -> ValidationResult:
+        """Validate credit spread widening during financial stress."""
+        spreads = index.spreads
+        
+        # Look for significant spread widening
+        min_spread, max_spread = _extreme_rows(spreads)
+        widening_found = (min_spread is not None and max_spread is not None and len(spreads) > 1
+                          and max_spread[2] > min_spread[2] * 1.5)  # 50%+ widening
+        
+        return ValidationResult(
+            check_name="credit_spreads_widen_with_bank_stress",
+            description="Credit spread widening",
+            passed=widening_found,
+            details={
+                "spread_series": spreads,
+                "widening_found": widening_found,
+                "max_spread": max_spread,
+                "min_spread": min_spread
+            }
+        )
+    
+    # check name -> handler(self, index, flat_initial, description)
+    _CHECKS: ClassVar[Dict[str, Callable[..., ValidationResult]]] = {
+        "policy_rate_adjusts_for_inflation":
+            lambda self, index, initial, desc: self._validate_taylor_rule_response(index, initial),
+        "inflation_changes_over_time":
+            lambda self, index, initial, desc: self._validate_inflation_evolution(index, initial),
+        "trigger_fires_on_schedule":
+            lambda self, index, initial, desc: self._validate_trigger_timing(index, desc),
+        "tariffs_increase_over_time":
+            lambda self, index, initial, desc: self._validate_tariff_escalation(index),
+        "fx_rate_increases_in_crisis":
+            lambda self, index, initial, desc: self._validate_currency_devaluation(index),
+        "credit_spreads_widen_with_bank_stress":
+            lambda self, index, initial, desc: self._validate_credit_spread_widening(index),
+    }
@@ -4,11 +4,24 @@ Comprehensive Scenario Analysis Tool
 Generates detailed reports on simulation realism, economic relationships, and step-by-step evolution.
 """
 
+import hashlib
 import json
+import os
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Callable, Dict, Iterable, List, Any, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from math import nan
+from dataclasses import asdict, dataclass, field, is_dataclass
+
+from _kernels import RAPID_CHANGE_THRESHOLD, mean_abs_diff, timing_stats
 
 # Optional plotting dependencies
 try:
@@ -18,6 +31,39 @@ try:
 except ImportError:
     HAS_PLOTTING = False
 
+# Optional faster / streaming JSON parsers
+try:
+    import orjson
+    HAS_ORJSON = True
+    REPORT_ORJSON_OPTIONS = (
+        orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Audit files larger than this are scanned one step at a time (needs ijson)
+STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+# Top-level audit fields read before the trail when streaming
+HEADER_KEYS = ("scenario_name", "timesteps_completed", "execution_time")
+# Audit files written by the runner: a header record, then one record per step
+NDJSON_SUFFIX = ".ndjson"
+# Bump whenever the shape or content of an analysis changes, so analyses
+# cached by earlier versions are recomputed
+ANALYSIS_CACHE_VERSION = 3
+# Issues listed per check; the rest are only counted
+MAX_REPORTED_ISSUES = 10
+# Buffer size for report files written in many small pieces
+WRITE_BUFFER_BYTES = 1 << 20
+
 
 @dataclass
 class EconomicInsight:
@@ -29,146 +75,565 @@ class EconomicInsight:
     concerns: List[str] = None
 
 
+# Key economic variables tracked through the state evolution
+TRACKED_VARIABLES = [
+    "countries.USA.macro.inflation",
+    "countries.USA.macro.policy_rate", 
+    "countries.USA.macro.debt_gdp",
+    "countries.CHN.macro.inflation",
+    "countries.DEU.macro.inflation",
+    "commodity_prices.oil",
+    "commodity_prices.gas"
+]
+
+
+def _make_accessor(path: str):
+    """Compile ``path`` into a function that reads it with chained subscripts.
+    
+    Equivalent to walking the split path, but without the per-part loop;
+    any missing key or non-dict level yields None.
+    """
+    body = "state" + "".join(f"[{part!r}]" for part in path.split("."))
+    source = (
+        "def accessor(state):\n"
+        "    try:\n"
+        f"        return {body}\n"
+        "    except (KeyError, TypeError, IndexError):\n"
+        "        return None\n"
+    )
+    namespace = {}
+    exec(compile(source, f"<accessor {path}>", "exec"), namespace)
+    return namespace["accessor"]
+
+
+# One compiled accessor per tracked variable instead of walking on every step
+_TRACKED_ACCESSORS = [(var, _make_accessor(var)) for var in TRACKED_VARIABLES]
+
+# Realistic bounds for macro variables: (key, label, low, high)
+MACRO_RANGES = (
+    ("inflation", "inflation", -0.05, 0.5),  # -5% to 50%
+    ("policy_rate", "policy rate", -0.01, 0.3),  # -1% to 30%
+    ("unemployment", "unemployment", 0, 0.5),  # 0% to 50%
+)
+_RANGE_KEYS = tuple(key for key, _, _, _ in MACRO_RANGES)
+_RANGE_LOW = np.array([low for _, _, low, _ in MACRO_RANGES], dtype=np.float64)
+_RANGE_HIGH = np.array([high for _, _, _, high in MACRO_RANGES], dtype=np.float64)
+
+TAYLOR_RULE_PATH = "countries.USA.macro.policy_rate"
+PHILLIPS_CURVE_PATH = "countries.USA.macro.inflation"
+
+# Field-path kinds the analyses bucket changes by (bit flags)
+PATH_TARIFF = 1
+PATH_TRADE_MATRIX = 2
+PATH_POLICY_RATE = 4
+PATH_FINANCIAL_STRESS = 8
+PATH_COUNTRY = 16
+# Sector coverage checked by the recommendations
+PATH_TRADE = 32
+PATH_EXTERNAL = 64
+
+
+# Substring -> path kind. Matching inside a lookahead finds overlapping
+# needles too (e.g. "tariff" and "fx_rate" in "tariffx_rate"). Only one
+# alternative matches per position, so "trade_matrix" is tried before its
+# prefix "trade" and carries the PATH_TRADE bit itself.
+_PATH_NEEDLES = {
+    "tariff": PATH_TARIFF,
+    "trade_matrix": PATH_TRADE_MATRIX | PATH_TRADE,
+    "trade": PATH_TRADE,
+    "external": PATH_EXTERNAL,
+    "policy_rate": PATH_POLICY_RATE,
+    "credit_spread": PATH_FINANCIAL_STRESS,
+    "fx_rate": PATH_FINANCIAL_STRESS,
+    "bank_tier1_ratio": PATH_FINANCIAL_STRESS,
+    "USA": PATH_COUNTRY,
+    "GBR": PATH_COUNTRY,
+    "EUR": PATH_COUNTRY,
+    "CHN": PATH_COUNTRY,
+}
+_PATH_NEEDLE_PATTERN = re.compile(
+    "(?=(" + "|".join(map(re.escape, _PATH_NEEDLES)) + "))"
+)
+
+
+@lru_cache(maxsize=None)
+def _path_kinds(path: str) -> int:
+    """Classify a field path once; audits repeat the same few paths every step."""
+    kinds = 0
+    for match in _PATH_NEEDLE_PATTERN.finditer(path):
+        kinds |= _PATH_NEEDLES[match.group(1)]
+    return kinds
+
+
+def _new_trigger_stats() -> Dict[str, Any]:
+    """Tally for a trigger not seen yet; ``first_fired`` is set on its first firing."""
+    return {
+        "first_fired": -1,
+        "fire_count": 0,
+        # Flat (step index, change index) pairs into the trail
+        "associated_changes": array('i')
+    }
+
+
+def _new_reducer_stats() -> Dict[str, Any]:
+    """Tally for a reducer not seen yet."""
+    return {
+        "execution_count": 0,
+        "field_changes": [],
+        "execution_times": []
+    }
+
+
+@dataclass
+class _AuditAggregates:
+    """Per-scenario aggregates collected in one pass over the audit trail."""
+    steps: int = 0
+    total_changes: int = 0
+    total_triggers: int = 0
+    reducer_consistency: bool = True
+    first_sequence: Tuple[str, ...] = None
+    # reducer sequence (tuple of names) -> number of steps that ran it
+    reducer_patterns: Counter = field(default_factory=Counter)
+    # variable -> ([timestep, ...], [value, ...])
+    trajectories: Dict[str, Tuple[List[int], List[float]]] = field(default_factory=dict)
+    triggers: Dict[str, Dict] = field(default_factory=lambda: defaultdict(_new_trigger_stats))
+    # Firing sequence as aligned columns: timestep and interned trigger name
+    firing_timesteps: array = field(default_factory=lambda: array('i'))
+    firing_triggers: List[str] = field(default_factory=list)
+    reducers: Dict[str, Dict] = field(default_factory=lambda: defaultdict(_new_reducer_stats))
+    # field_path -> [(timestep, change), ...]
+    by_path: Dict[str, List[Tuple[int, Dict]]] = field(default_factory=lambda: defaultdict(list))
+    tariff_changes: List[Dict] = field(default_factory=list)
+    trade_changes: List[Dict] = field(default_factory=list)
+    policy_changes: List[Dict] = field(default_factory=list)
+    contagion_events: int = 0
+    max_countries_affected: int = 0
+    # Union of the path kinds of every changed field
+    seen_kinds: int = 0
+    # First MAX_REPORTED_ISSUES range issues, and how many there were in all
+    range_issues: List[str] = field(default_factory=list)
+    range_issue_count: int = 0
+    rapid_changes: int = 0
+    total_value_changes: int = 0
+    causal_chains: List[Dict] = field(default_factory=list)
+
+
+@lru_cache(maxsize=None)
+def scenario_slug(scenario_name: str) -> str:
+    """File-name form of a scenario name, e.g. "Trade War" -> "trade_war"."""
+    return scenario_name.lower().replace(' ', '_')
+
+
+# Exact-type converters for the objects reports actually contain; checked
+# before the isinstance fallbacks below
+_JSON_DEFAULTS = {
+    np.ndarray: np.ndarray.tolist,
+    np.float64: np.float64.item,
+    np.int64: np.int64.item,
+    np.int32: np.int32.item,
+    np.bool_: np.bool_.item,
+    Path: str,
+}
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize NumPy arrays and scalars as plain JSON; anything else as str."""
+    convert = _JSON_DEFAULTS.get(type(obj))
+    if convert is not None:
+        return convert(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def _cache_default(obj: Any) -> Any:
+    """Like _json_default, but keeps dataclasses as objects so they can be rebuilt."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    return _json_default(obj)
+
+
+# Markdown summary templates for the per-item sections, filled with format_map
+_RELATIONSHIP_TEMPLATE = """
+### {relationship}
+- **Realism Score**: {realism_score:.2f}
+- **Description**: {description}
+- **Sample Size**: {sample_size}
+"""
+_EVOLUTION_TEMPLATE = """
+### {var}
+- **Initial**: {initial_value:.4f}
+- **Final**: {final_value:.4f}
+- **Change**: {change:.4f}
+- **Trend**: {trend}
+"""
+_TRIGGER_TEMPLATE = """
+### {name}
+- **First Fired**: Timestep {first_fired}
+- **Fire Count**: {fire_count}
+- **Associated Changes**: {associated_count}
+"""
+_INSIGHT_TEMPLATE = """
+### {category}
+- **Description**: {description}
+- **Realism Score**: {realism_score:.2f}
+"""
+
+
 class ScenarioAnalyzer:
     """Analyzes scenario execution results for economic realism."""
     
     def __init__(self):
         self.reports_dir = Path("reports")
         self.reports_dir.mkdir(exist_ok=True)
+        self._cache_dir = self.reports_dir / ".analysis_cache"
+        # Report paths are composed as plain strings from this prefix
+        self._reports_prefix = os.fspath(self.reports_dir) + os.sep
     
     def analyze_scenario(self, audit_file: Path) -> Dict[str, Any]:
         """Perform comprehensive analysis of a scenario."""
-        with open(audit_file, 'r') as f:
-            data = json.load(f)
+        # Reuse the analysis of an unchanged audit file
+        cache_file = self._analysis_cache_file(audit_file)
+        cached = self._load_cached_analysis(cache_file)
+        if cached is not None:
+            return cached
+        
+        # Every analysis below reads from one fused traversal of the audit trail
+        streaming = audit_file.stat().st_size > STREAM_THRESHOLD_BYTES
+        if streaming and audit_file.suffix == NDJSON_SUFFIX:
+            # Records are already one per line: parse each step as it is read
+            with open(audit_file, 'rb') as f:
+                data = _loads(f.readline())
+                agg = self._scan(_loads(line) for line in f if line.strip())
+        elif streaming and HAS_IJSON:
+            # Never materialize the whole trail: parse the header, then feed
+            # the scan one step at a time
+            with open(audit_file, 'rb') as f:
+                data = self._read_header(f)
+                f.seek(0)
+                agg = self._scan(ijson.items(f, "audit_trail.item", use_float=True))
+        else:
+            data = self._load_audit(audit_file)
+            agg = self._scan(data["audit_trail"])
         
         analysis = {
             "scenario_name": data["scenario_name"],
-            "execution_summary": self._analyze_execution_summary(data),
-            "state_evolution": self._analyze_state_evolution(data["audit_trail"]),
-            "trigger_analysis": self._analyze_triggers(data["audit_trail"]),
-            "reducer_analysis": self._analyze_reducers(data["audit_trail"]),
-            "economic_relationships": self._analyze_economic_relationships(data["audit_trail"]),
-            "realism_assessment": self._assess_realism(data["audit_trail"]),
-            "key_insights": self._extract_key_insights(data["audit_trail"]),
-            "recommendations": self._generate_recommendations(data["audit_trail"])
+            "execution_summary": self._analyze_execution_summary(data, agg),
+            "state_evolution": self._analyze_state_evolution(agg),
+            "trigger_analysis": self._analyze_triggers(agg),
+            "reducer_analysis": self._analyze_reducers(agg),
+            "economic_relationships": self._analyze_economic_relationships(agg),
+            "realism_assessment": self._assess_realism(agg),
+            "key_insights": self._extract_key_insights(agg),
+            "recommendations": self._generate_recommendations(agg)
         }
         
+        self._store_cached_analysis(cache_file, analysis)
         return analysis
     
-    def _analyze_execution_summary(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze high-level execution metrics."""
-        audit_trail = data["audit_trail"]
+    def _analysis_cache_file(self, audit_file: Path) -> Path:
+        """Cache entry for an audit file, keyed by its path and modification time."""
+        key = f"{audit_file.resolve()}:{audit_file.stat().st_mtime_ns}:{ANALYSIS_CACHE_VERSION}"
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return self._cache_dir / f"{digest}.json"
+    
+    def _load_cached_analysis(self, cache_file: Path) -> Dict[str, Any]:
+        """Return a cached analysis, or None if it is missing or unreadable."""
+        try:
+            raw = cache_file.read_bytes()
+            analysis = _loads(raw)
+            analysis["key_insights"] = [
+                self._insight_from_cache(insight) for insight in analysis["key_insights"]
+            ]
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        return analysis
+    
+    def _insight_from_cache(self, data: Dict[str, Any]) -> EconomicInsight:
+        """Rebuild an insight, restoring the tuples JSON turned into lists."""
+        evidence = data["evidence"]
+        if "rate_range" in evidence:
+            evidence["rate_range"] = tuple(evidence["rate_range"])
+        if "trigger_sequence" in evidence:
+            evidence["trigger_sequence"] = [tuple(event) for event in evidence["trigger_sequence"]]
+        return EconomicInsight(**data)
+    
+    def _store_cached_analysis(self, cache_file: Path, analysis: Dict[str, Any]):
+        """Write an analysis to the cache; a temp file and rename keep readers safe."""
+        if HAS_ORJSON:
+            raw = orjson.dumps(
+                analysis, default=_cache_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            raw = json.dumps(analysis, default=_cache_default).encode()
+        
+        self._cache_dir.mkdir(exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(raw)
+        tmp_file.replace(cache_file)
+    
+    def _load_audit(self, audit_file: Path) -> Dict[str, Any]:
+        """Parse an audit file, with orjson when it is installed."""
+        if audit_file.suffix == NDJSON_SUFFIX:
+            with open(audit_file, 'rb') as f:
+                header, *steps = f.read().splitlines()
+            data = _loads(header)
+            data["audit_trail"] = [_loads(line) for line in steps if line.strip()]
+            return data
+        if HAS_ORJSON:
+            with open(audit_file, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(audit_file, 'r') as f:
+            return json.load(f)
+    
+    def _read_header(self, f) -> Dict[str, Any]:
+        """Read the top-level scalar fields of an audit file without its trail."""
+        header = {}
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix in HEADER_KEYS:
+                header[prefix] = value
+            elif prefix == "audit_trail" and event == "start_array" and len(header) == len(HEADER_KEYS):
+                break
+        return header
+    
+    @staticmethod
+    def _scan(audit_trail: Iterable[Dict]) -> _AuditAggregates:
+        """Collect every per-step aggregate the analyses need in a single pass.
+        
+        ``audit_trail`` is only iterated once, so it may be a stream of steps.
+        """
+        agg = _AuditAggregates()
+        
+        # Hoisted accessors and aggregate bindings for the hot loops
+        get_step = itemgetter("timestep", "state", "audit")
+        get_audit = itemgetter("field_changes", "triggers_fired", "reducer_sequence")
+        get_change = itemgetter("field_path", "old_value", "new_value")
+        by_path = agg.by_path
+        # Paths and reducer names repeat every step; interning them shares one
+        # string object across the trail and makes key comparisons identity checks
+        intern = sys.intern
+        # Numeric old/new pairs, reduced by the timing kernel after the scan
+        old_values = array('d')
+        new_values = array('d')
+        seen_kinds = 0
+        # Macro values in MACRO_RANGES order, row-aligned with timestep and country
+        range_values = array('d')
+        range_timesteps = array('i')
+        range_countries = []
         
-        total_changes = sum(len(step["audit"]["field_changes"]) for step in audit_trail)
-        total_triggers = sum(len(step["audit"]["triggers_fired"]) for step in audit_trail)
+        for i, step in enumerate(audit_trail):
+            timestep, state, audit = get_step(step)
+            changes, fired, seq = get_audit(audit)
+            # A tuple of interned names is both the comparison value and the
+            # pattern key, so no joined string is built per step
+            seq = tuple(map(intern, seq))
+            
+            agg.steps += 1
+            agg.total_changes += len(changes)
+            agg.total_triggers += len(fired)
+            if agg.first_sequence is None:
+                agg.first_sequence = seq
+            elif seq != agg.first_sequence:
+                agg.reducer_consistency = False
+            agg.reducer_patterns[seq] += 1
+            
+            # State evolution
+            for var, accessor in _TRACKED_ACCESSORS:
+                value = accessor(state)
+                if value is not None:
+                    timesteps, values = agg.trajectories.setdefault(var, ([], []))
+                    timesteps.append(timestep)
+                    values.append(value)
+            
+            # Variable ranges: one row per (step, country), checked after the scan
+            for country_code, country_data in state.get("countries", {}).items():
+                macro = country_data.get("macro", {})
+                range_timesteps.append(timestep)
+                range_countries.append(country_code)
+                for key in _RANGE_KEYS:
+                    value = macro.get(key)
+                    # Missing values become NaN, which never fails a bound
+                    range_values.append(nan if value is None else value)
+            
+            # Field changes
+            step_details = []
+            changes_by_reducer = defaultdict(list)
+            trigger_effects = []
+            stress_changes = 0
+            country_changes = 0
+            countries_seen = set()
+            for change in changes:
+                path, old_value, new_value = get_change(change)
+                path = change["field_path"] = intern(path)
+                reducer_name = change.get("reducer_name")
+                if reducer_name is not None:
+                    reducer_name = change["reducer_name"] = intern(reducer_name)
+                by_path[path].append((timestep, change))
+                changes_by_reducer[reducer_name].append(change)
+                # Calculation details only feed trigger attribution, so most
+                # steps (the ones where nothing fired) never look at them
+                if fired:
+                    details = change.get("calculation_details", {})
+                    step_details.append(details)
+                    if details.get("trigger_action"):
+                        trigger_effects.append(path)
+                
+                kinds = _path_kinds(path)
+                seen_kinds |= kinds
+                if kinds:
+                    if kinds & PATH_TARIFF:
+                        agg.tariff_changes.append({
+                            "timestep": timestep,
+                            "field": path,
+                            "old_value": old_value,
+                            "new_value": new_value
+                        })
+                    
+                    if kinds & PATH_TRADE_MATRIX:
+                        agg.trade_changes.append({
+                            "timestep": timestep,
+                            "field": path,
+                            "old_value": old_value,
+                            "new_value": new_value
+                        })
+                    
+                    if kinds & PATH_POLICY_RATE:
+                        agg.policy_changes.append(change)
+                    
+                    # Financial stress indicators and the country-level changes
+                    # they may have spread to
+                    if kinds & PATH_FINANCIAL_STRESS:
+                        stress_changes += 1
+                    if kinds & PATH_COUNTRY:
+                        country_changes += 1
+                        countries_seen.add(path.split(".", 2)[1])
+                
+                # Timing realism inputs
+                if old_value is not None and new_value is not None:
+                    old_values.append(old_value)
+                    new_values.append(new_value)
+            
+            # Triggers and the changes they caused
+            for trigger_name in fired:
+                trigger_name = intern(trigger_name)
+                stats = agg.triggers[trigger_name]
+                if stats["first_fired"] < 0:
+                    stats["first_fired"] = timestep
+                stats["fire_count"] += 1
+                agg.firing_timesteps.append(timestep)
+                agg.firing_triggers.append(trigger_name)
+                associated = stats["associated_changes"]
+                for j, details in enumerate(step_details):
+                    if details.get("trigger_action") or trigger_name in details.get("triggers_fired", []):
+                        associated.append(i)
+                        associated.append(j)
+            
+            if fired:
+                agg.causal_chains.append({
+                    "timestep": timestep,
+                    "triggers": fired,
+                    "immediate_effects": trigger_effects
+                })
+            
+            # Reducers and the changes attributed to them
+            for reducer in seq:
+                stats = agg.reducers[reducer]
+                stats["execution_count"] += 1
+                stats["field_changes"].extend(changes_by_reducer.get(reducer, ()))
+            
+            # Contagion: stress changes alongside changes in several countries
+            if i > 0 and stress_changes and country_changes > 1:
+                agg.contagion_events += stress_changes
+                agg.max_countries_affected = max(agg.max_countries_affected, len(countries_seen))
+        
+        agg.seen_kinds = seen_kinds
+        
+        # Rows come out of argwhere in scan order, so the first issues reported
+        # are the earliest ones; text is only built for those
+        values = np.frombuffer(range_values).reshape(-1, len(MACRO_RANGES))
+        flagged = np.argwhere((values < _RANGE_LOW) | (values > _RANGE_HIGH))
+        agg.range_issue_count = len(flagged)
+        for row, var in flagged[:MAX_REPORTED_ISSUES]:
+            agg.range_issues.append(
+                f"Timestep {range_timesteps[row]}: {range_countries[row]} {MACRO_RANGES[var][1]} "
+                f"{values[row, var]:.3f} outside realistic range"
+            )
+        
+        # >10% change per timestep (or a significant move off zero) is rapid
+        agg.rapid_changes, agg.total_value_changes = timing_stats(
+            np.frombuffer(old_values), np.frombuffer(new_values), RAPID_CHANGE_THRESHOLD
+        )
+        return agg
+    
+    def _analyze_execution_summary(self, data: Dict[str, Any], agg: _AuditAggregates) -> Dict[str, Any]:
+        """Analyze high-level execution metrics."""
+        total_changes = agg.total_changes
         
         return {
             "timesteps_completed": data["timesteps_completed"],
             "execution_time_seconds": data["execution_time"],
             "total_field_changes": total_changes,
-            "average_changes_per_step": total_changes / len(audit_trail) if audit_trail else 0,
-            "total_triggers_fired": total_triggers,
-            "reducer_consistency": self._check_reducer_consistency(audit_trail),
+            "average_changes_per_step": total_changes / agg.steps if agg.steps else 0,
+            "total_triggers_fired": agg.total_triggers,
+            "reducer_consistency": agg.reducer_consistency,
             "performance_metrics": {
-                "avg_step_time_ms": (data["execution_time"] * 1000) / len(audit_trail) if audit_trail else 0,
+                "avg_step_time_ms": (data["execution_time"] * 1000) / agg.steps if agg.steps else 0,
                 "changes_per_second": total_changes / data["execution_time"] if data["execution_time"] > 0 else 0
             }
         }
     
-    def _analyze_state_evolution(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _analyze_state_evolution(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Analyze how state variables evolve over time."""
         evolution = {}
         
-        # Track key economic variables
-        variables_to_track = [
-            "countries.USA.macro.inflation",
-            "countries.USA.macro.policy_rate", 
-            "countries.USA.macro.debt_gdp",
-            "countries.CHN.macro.inflation",
-            "countries.DEU.macro.inflation",
-            "commodity_prices.oil",
-            "commodity_prices.gas"
-        ]
-        
-        for var in variables_to_track:
-            trajectory = []
-            for step in audit_trail:
-                value = self._extract_nested_value(step["state"], var)
-                if value is not None:
-                    trajectory.append({
-                        "timestep": step["timestep"],
-                        "value": value
-                    })
-            
-            if trajectory:
-                evolution[var] = {
-                    "trajectory": trajectory,
-                    "initial_value": trajectory[0]["value"],
-                    "final_value": trajectory[-1]["value"],
-                    "change": trajectory[-1]["value"] - trajectory[0]["value"],
-                    "volatility": self._calculate_volatility([t["value"] for t in trajectory]),
-                    "trend": self._analyze_trend([t["value"] for t in trajectory])
-                }
+        for var, (timesteps, values) in agg.trajectories.items():
+            values = np.asarray(values, dtype=np.float64)
+            evolution[var] = {
+                # Arrays are converted to lists when the report is written
+                "trajectory": {
+                    "timesteps": np.asarray(timesteps, dtype=np.int32),
+                    "values": values
+                },
+                "initial_value": float(values[0]),
+                "final_value": float(values[-1]),
+                "change": float(values[-1] - values[0]),
+                "volatility": self._calculate_volatility(values),
+                "trend": self._analyze_trend(values)
+            }
         
         return evolution
     
-    def _analyze_triggers(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _analyze_triggers(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Analyze trigger firing patterns and effects."""
-        trigger_analysis = {
-            "triggers_fired": {},
-            "firing_sequence": [],
+        return {
+            "triggers_fired": {
+                # associated_changes rows are (step index, change index):
+                # audit_trail[step]["audit"]["field_changes"][change]
+                name: dict(info, associated_changes=np.frombuffer(
+                    info["associated_changes"], dtype=np.int32
+                ).reshape(-1, 2))
+                for name, info in agg.triggers.items()
+            },
+            "firing_sequence": {
+                "timesteps": np.frombuffer(agg.firing_timesteps, dtype=np.int32),
+                "triggers": np.array(agg.firing_triggers, dtype=object)
+            },
             "trigger_effects": {}
         }
-        
-        for step in audit_trail:
-            for trigger_name in step["audit"]["triggers_fired"]:
-                if trigger_name not in trigger_analysis["triggers_fired"]:
-                    trigger_analysis["triggers_fired"][trigger_name] = {
-                        "first_fired": step["timestep"],
-                        "fire_count": 0,
-                        "associated_changes": []
-                    }
-                
-                trigger_analysis["triggers_fired"][trigger_name]["fire_count"] += 1
-                trigger_analysis["firing_sequence"].append({
-                    "timestep": step["timestep"],
-                    "trigger": trigger_name
-                })
-                
-                # Analyze immediate effects
-                trigger_changes = [
-                    change for change in step["audit"]["field_changes"]
-                    if change.get("calculation_details", {}).get("trigger_action") 
-                    or trigger_name in change.get("calculation_details", {}).get("triggers_fired", [])
-                ]
-                
-                trigger_analysis["triggers_fired"][trigger_name]["associated_changes"].extend(
-                    [(step["timestep"], change) for change in trigger_changes]
-                )
-        
-        return trigger_analysis
     
-    def _analyze_reducers(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _analyze_reducers(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Analyze reducer execution patterns."""
-        reducer_stats = {}
-        
-        for step in audit_trail:
-            for reducer in step["audit"]["reducer_sequence"]:
-                if reducer not in reducer_stats:
-                    reducer_stats[reducer] = {
-                        "execution_count": 0,
-                        "field_changes": [],
-                        "execution_times": []
-                    }
-                
-                reducer_stats[reducer]["execution_count"] += 1
-                
-                # Find changes attributed to this reducer
-                reducer_changes = [
-                    change for change in step["audit"]["field_changes"]
-                    if change.get("reducer_name") == reducer
-                ]
-                reducer_stats[reducer]["field_changes"].extend(reducer_changes)
+        reducer_stats = agg.reducers
         
         # Calculate reducer efficiency metrics
         for reducer, stats in reducer_stats.items():
@@ -179,173 +644,132 @@ class ScenarioAnalyzer:
         
         return reducer_stats
     
-    def _analyze_economic_relationships(self, audit_trail: List[Dict]) -> List[Dict[str, Any]]:
+    def _analyze_economic_relationships(self, agg: _AuditAggregates) -> List[Dict[str, Any]]:
         """Analyze key economic relationships for realism."""
         relationships = []
         
         # Taylor Rule Analysis
-        taylor_analysis = self._analyze_taylor_rule(audit_trail)
+        taylor_analysis = self._analyze_taylor_rule(agg)
         if taylor_analysis:
             relationships.append(taylor_analysis)
         
         # Phillips Curve Analysis  
-        phillips_analysis = self._analyze_phillips_curve(audit_trail)
+        phillips_analysis = self._analyze_phillips_curve(agg)
         if phillips_analysis:
             relationships.append(phillips_analysis)
         
         # Trade-Tariff Relationship
-        trade_tariff_analysis = self._analyze_trade_tariff_relationship(audit_trail)
+        trade_tariff_analysis = self._analyze_trade_tariff_relationship(agg)
         if trade_tariff_analysis:
             relationships.append(trade_tariff_analysis)
         
         # Crisis Contagion Analysis
-        contagion_analysis = self._analyze_crisis_contagion(audit_trail)
+        contagion_analysis = self._analyze_crisis_contagion(agg)
         if contagion_analysis:
             relationships.append(contagion_analysis)
         
         return relationships
     
-    def _analyze_taylor_rule(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _analyze_taylor_rule(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Analyze Taylor Rule implementation for realism."""
-        taylor_changes = []
-        
-        for step in audit_trail:
-            for change in step["audit"]["field_changes"]:
-                if (change["field_path"] == "countries.USA.macro.policy_rate" and 
-                    change.get("calculation_details", {}).get("rule") == "taylor"):
-                    
-                    taylor_changes.append({
-                        "timestep": step["timestep"],
-                        "inflation": change["calculation_details"]["inflation"],
-                        "inflation_target": change["calculation_details"]["inflation_target"],
-                        "output_gap": change["calculation_details"]["output_gap"],
-                        "neutral_rate": change["calculation_details"]["neutral_rate"],
-                        "old_rate": change["old_value"],
-                        "new_rate": change["new_value"],
-                        "phi_pi": change["calculation_details"]["phi_pi"],
-                        "phi_y": change["calculation_details"]["phi_y"]
-                    })
-        
-        if not taylor_changes:
+        timesteps = []
+        rows = []
+        
+        for timestep, change in agg.by_path.get(TAYLOR_RULE_PATH, ()):
+            details = change.get("calculation_details", {})
+            if details.get("rule") == "taylor":
+                timesteps.append(timestep)
+                rows.append((
+                    details["inflation"],
+                    details["inflation_target"],
+                    details["output_gap"],
+                    details["neutral_rate"],
+                    change["new_value"],
+                    details["phi_pi"],
+                    details["phi_y"]
+                ))
+        
+        if not rows:
             return None
         
-        # Validate Taylor Rule implementation
-        realism_score = 0.0
-        issues = []
-        
-        for change in taylor_changes:
-            inflation_gap = change["inflation"] - change["inflation_target"]
-            expected_adjustment = (change["phi_pi"] * inflation_gap + 
-                                 change["phi_y"] * change["output_gap"])
-            
-            actual_change = change["new_rate"] - change["neutral_rate"]
-            theoretical_rate = change["neutral_rate"] + expected_adjustment
-            
-            error = abs(change["new_rate"] - theoretical_rate)
-            if error < 0.001:
-                realism_score += 1.0
-            elif error < 0.01:
-                realism_score += 0.8
-            else:
-                realism_score += 0.5
-                issues.append(f"Timestep {change['timestep']}: Taylor rule error {error:.4f}")
-        
-        realism_score /= len(taylor_changes)
+        # Validate Taylor Rule implementation, one column per variable
+        inflation, inflation_target, output_gap, neutral_rate, new_rate, phi_pi, phi_y = (
+            np.array(rows, dtype=np.float64).T
+        )
+        expected_adjustment = phi_pi * (inflation - inflation_target) + phi_y * output_gap
+        theoretical_rate = neutral_rate + expected_adjustment
+        error = np.abs(new_rate - theoretical_rate)
+        
+        realism_score = float(np.select([error < 0.001, error < 0.01], [1.0, 0.8], default=0.5).mean())
+        flagged = np.flatnonzero(error >= 0.01)
+        issues = [
+            f"Timestep {timesteps[i]}: Taylor rule error {error[i]:.4f}"
+            for i in flagged[:MAX_REPORTED_ISSUES]
+        ]
         
         return {
             "relationship": "Taylor Rule",
             "description": "Central bank policy rate response to inflation and output gaps",
             "realism_score": realism_score,
-            "sample_size": len(taylor_changes),
+            "sample_size": len(rows),
             "issues": issues,
+            "total_issues": int(flagged.size),
             "details": {
-                "average_phi_pi": sum(c["phi_pi"] for c in taylor_changes) / len(taylor_changes),
-                "average_phi_y": sum(c["phi_y"] for c in taylor_changes) / len(taylor_changes),
-                "rate_range": (
-                    min(c["new_rate"] for c in taylor_changes),
-                    max(c["new_rate"] for c in taylor_changes)
-                )
+                "average_phi_pi": float(phi_pi.mean()),
+                "average_phi_y": float(phi_y.mean()),
+                "rate_range": (float(new_rate.min()), float(new_rate.max()))
             }
         }
     
-    def _analyze_phillips_curve(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _analyze_phillips_curve(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Analyze Phillips Curve implementation."""
-        phillips_changes = []
-        
-        for step in audit_trail:
-            for change in step["audit"]["field_changes"]:
-                if (change["field_path"] == "countries.USA.macro.inflation" and 
-                    "phillips_curve" in change.get("calculation_details", {})):
-                    
-                    details = change["calculation_details"]
-                    phillips_changes.append({
-                        "timestep": step["timestep"],
-                        "old_inflation": change["old_value"],
-                        "new_inflation": change["new_value"],
-                        "expected_inflation": details["expected_inflation"],
-                        "output_gap": details["output_gap"],
-                        "beta": details["beta"],
-                        "kappa": details["kappa"]
-                    })
-        
-        if not phillips_changes:
+        timesteps = []
+        rows = []
+        
+        for timestep, change in agg.by_path.get(PHILLIPS_CURVE_PATH, ()):
+            details = change.get("calculation_details", {})
+            if "phillips_curve" in details:
+                timesteps.append(timestep)
+                rows.append((
+                    change["new_value"],
+                    details["expected_inflation"],
+                    details["output_gap"],
+                    details["beta"],
+                    details["kappa"]
+                ))
+        
+        if not rows:
             return None
         
-        # Validate Phillips Curve
-        realism_score = 0.0
-        issues = []
+        # Validate Phillips Curve: π_t = β*E[π_{t+1}] + κ*y_t + ε_t
+        new_inflation, expected_inflation, output_gap, beta, kappa = np.array(rows, dtype=np.float64).T
+        theoretical_inflation = beta * expected_inflation + kappa * output_gap
+        error = np.abs(new_inflation - theoretical_inflation)
         
-        for change in phillips_changes:
-            # π_t = β*E[π_{t+1}] + κ*y_t + ε_t
-            expected_inflation_component = change["beta"] * change["expected_inflation"]
-            output_gap_component = change["kappa"] * change["output_gap"]
-            theoretical_inflation = expected_inflation_component + output_gap_component
-            
-            error = abs(change["new_inflation"] - theoretical_inflation)
-            if error < 0.01:
-                realism_score += 1.0
-            elif error < 0.02:
-                realism_score += 0.8
-            else:
-                realism_score += 0.6
-                issues.append(f"Timestep {change['timestep']}: Phillips curve error {error:.4f}")
-        
-        realism_score /= len(phillips_changes)
+        realism_score = float(np.select([error < 0.01, error < 0.02], [1.0, 0.8], default=0.6).mean())
+        flagged = np.flatnonzero(error >= 0.02)
+        issues = [
+            f"Timestep {timesteps[i]}: Phillips curve error {error[i]:.4f}"
+            for i in flagged[:MAX_REPORTED_ISSUES]
+        ]
         
         return {
             "relationship": "Phillips Curve",
             "description": "Inflation response to output gaps and expectations",
             "realism_score": realism_score,
-            "sample_size": len(phillips_changes),
+            "sample_size": len(rows),
             "issues": issues,
+            "total_issues": int(flagged.size),
             "details": {
-                "average_beta": sum(c["beta"] for c in phillips_changes) / len(phillips_changes),
-                "average_kappa": sum(c["kappa"] for c in phillips_changes) / len(phillips_changes)
+                "average_beta": float(beta.mean()),
+                "average_kappa": float(kappa.mean())
             }
         }
     
-    def _analyze_trade_tariff_relationship(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _analyze_trade_tariff_relationship(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Analyze relationship between tariffs and trade volumes."""
-        tariff_changes = []
-        trade_changes = []
-        
-        for step in audit_trail:
-            for change in step["audit"]["field_changes"]:
-                if "tariff" in change["field_path"]:
-                    tariff_changes.append({
-                        "timestep": step["timestep"],
-                        "field": change["field_path"],
-                        "old_value": change["old_value"],
-                        "new_value": change["new_value"]
-                    })
-                
-                if "trade_matrix" in change["field_path"]:
-                    trade_changes.append({
-                        "timestep": step["timestep"],
-                        "field": change["field_path"],
-                        "old_value": change["old_value"],
-                        "new_value": change["new_value"]
-                    })
+        tariff_changes = agg.tariff_changes
+        trade_changes = agg.trade_changes
         
         if not tariff_changes and not trade_changes:
             return None
@@ -363,62 +787,32 @@ class ScenarioAnalyzer:
             }
         }
     
-    def _analyze_crisis_contagion(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _analyze_crisis_contagion(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Analyze crisis contagion mechanisms."""
-        contagion_evidence = []
-        
-        # Look for patterns where problems in one country affect others
-        for i, step in enumerate(audit_trail):
-            if i == 0:
-                continue
-                
-            prev_step = audit_trail[i-1]
-            
-            # Check for financial stress indicators
-            for change in step["audit"]["field_changes"]:
-                if ("credit_spread" in change["field_path"] or 
-                    "fx_rate" in change["field_path"] or
-                    "bank_tier1_ratio" in change["field_path"]):
-                    
-                    # Look for simultaneous changes in multiple countries
-                    country_changes = [
-                        c for c in step["audit"]["field_changes"] 
-                        if any(country in c["field_path"] for country in ["USA", "GBR", "EUR", "CHN"])
-                    ]
-                    
-                    if len(country_changes) > 1:
-                        contagion_evidence.append({
-                            "timestep": step["timestep"],
-                            "trigger_change": change,
-                            "affected_countries": len(set(
-                                c["field_path"].split(".")[1] for c in country_changes
-                            )),
-                            "changes": country_changes
-                        })
-        
-        if not contagion_evidence:
+        # Problems in one country affecting others, counted during the scan
+        if not agg.contagion_events:
             return None
         
         return {
             "relationship": "Crisis Contagion",
             "description": "Transmission of financial stress between countries",
             "realism_score": 0.7,
-            "sample_size": len(contagion_evidence),
+            "sample_size": agg.contagion_events,
             "details": {
-                "contagion_events": len(contagion_evidence),
-                "max_countries_affected": max(e["affected_countries"] for e in contagion_evidence),
+                "contagion_events": agg.contagion_events,
+                "max_countries_affected": agg.max_countries_affected,
                 "primary_transmission_channels": ["credit_spread", "fx_rate", "interbank_linkages"]
             }
         }
     
-    def _assess_realism(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _assess_realism(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Overall realism assessment."""
         assessments = []
         
         # Check for economic consistency
-        assessments.append(self._assess_variable_ranges(audit_trail))
-        assessments.append(self._assess_causality_chains(audit_trail))
-        assessments.append(self._assess_timing_realism(audit_trail))
+        assessments.append(self._assess_variable_ranges(agg))
+        assessments.append(self._assess_causality_chains(agg))
+        assessments.append(self._assess_timing_realism(agg))
         
         # Filter out None assessments and calculate overall score
         valid_assessments = [a for a in assessments if a is not None and "score" in a]
@@ -435,62 +829,26 @@ class ScenarioAnalyzer:
             "summary": self._generate_realism_summary(overall_score, valid_assessments)
         }
     
-    def _assess_variable_ranges(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _assess_variable_ranges(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Check if economic variables stay within realistic ranges."""
-        issues = []
-        score = 1.0
-        
-        for step in audit_trail:
-            state = step["state"]
-            
-            # Check key variables for realistic ranges
-            for country_code, country_data in state.get("countries", {}).items():
-                macro = country_data.get("macro", {})
-                
-                # Inflation should be reasonable (-5% to 50%)
-                inflation = macro.get("inflation")
-                if inflation is not None and (inflation < -0.05 or inflation > 0.5):
-                    issues.append(f"Timestep {step['timestep']}: {country_code} inflation {inflation:.3f} outside realistic range")
-                    score -= 0.1
-                
-                # Policy rate should be reasonable (-1% to 30%)
-                policy_rate = macro.get("policy_rate") 
-                if policy_rate is not None and (policy_rate < -0.01 or policy_rate > 0.3):
-                    issues.append(f"Timestep {step['timestep']}: {country_code} policy rate {policy_rate:.3f} outside realistic range")
-                    score -= 0.1
-                
-                # Unemployment should be reasonable (0% to 50%)
-                unemployment = macro.get("unemployment")
-                if unemployment is not None and (unemployment < 0 or unemployment > 0.5):
-                    issues.append(f"Timestep {step['timestep']}: {country_code} unemployment {unemployment:.3f} outside realistic range")
-                    score -= 0.1
+        # 0.1 off per issue, floored at zero; rounded because 1.0 - 0.1 * 3
+        # is 0.6999..., which would fall just below the 0.7 grade boundary
+        score = round(max(1.0 - 0.1 * agg.range_issue_count, 0.0), 2)
         
         return {
             "assessment": "Variable Range Check",
-            "score": max(score, 0.0),
-            "issues": issues[:10],  # Limit to 10 issues
-            "total_issues": len(issues)
+            "score": score,
+            "issues": agg.range_issues,  # First MAX_REPORTED_ISSUES only
+            "total_issues": agg.range_issue_count
         }
     
-    def _assess_causality_chains(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _assess_causality_chains(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Assess whether cause-effect relationships make economic sense."""
         # This is a simplified implementation - could be expanded significantly
         score = 0.8  # Default reasonable score
         
-        # Look for trigger → effect chains
-        causal_chains = []
-        for step in audit_trail:
-            if step["audit"]["triggers_fired"]:
-                trigger_effects = []
-                for change in step["audit"]["field_changes"]:
-                    if change.get("calculation_details", {}).get("trigger_action"):
-                        trigger_effects.append(change["field_path"])
-                
-                causal_chains.append({
-                    "timestep": step["timestep"],
-                    "triggers": step["audit"]["triggers_fired"],
-                    "immediate_effects": trigger_effects
-                })
+        # Trigger → effect chains
+        causal_chains = agg.causal_chains
         
         return {
             "assessment": "Causality Chain Analysis",
@@ -499,27 +857,14 @@ class ScenarioAnalyzer:
             "examples": causal_chains[:3]
         }
     
-    def _assess_timing_realism(self, audit_trail: List[Dict]) -> Dict[str, Any]:
+    def _assess_timing_realism(self, agg: _AuditAggregates) -> Dict[str, Any]:
         """Assess whether the timing of economic adjustments is realistic."""
         # Check that adjustments don't happen instantaneously
         timing_score = 0.9
         
         # Most economic adjustments should show gradual changes
-        rapid_changes = 0
-        total_changes = 0
-        
-        for step in audit_trail:
-            for change in step["audit"]["field_changes"]:
-                if change["old_value"] is not None and change["new_value"] is not None and change["old_value"] != 0:
-                    pct_change = abs((change["new_value"] - change["old_value"]) / change["old_value"])
-                    if pct_change > 0.1:  # >10% change per timestep is rapid
-                        rapid_changes += 1
-                    total_changes += 1
-                elif change["old_value"] == 0 and change["new_value"] is not None:
-                    # Handle zero-to-nonzero transitions as potentially rapid
-                    if abs(change["new_value"]) > 0.01:  # Significant absolute change
-                        rapid_changes += 1
-                    total_changes += 1
+        rapid_changes = agg.rapid_changes
+        total_changes = agg.total_value_changes
         
         if total_changes > 0:
             rapid_change_ratio = rapid_changes / total_changes
@@ -534,37 +879,36 @@ class ScenarioAnalyzer:
             "rapid_change_ratio": rapid_changes / total_changes if total_changes > 0 else 0
         }
     
-    def _extract_key_insights(self, audit_trail: List[Dict]) -> List[EconomicInsight]:
+    def _extract_key_insights(self, agg: _AuditAggregates) -> List[EconomicInsight]:
         """Extract key economic insights from the scenario."""
         insights = []
         
         # Monetary policy effectiveness
-        policy_changes = [
-            change for step in audit_trail
-            for change in step["audit"]["field_changes"]
-            if "policy_rate" in change["field_path"]
-        ]
+        policy_changes = agg.policy_changes
         
         if policy_changes:
+            # One pass over the changes; min/max then run over a plain list
+            rates = []
+            taylor_applications = 0
+            for c in policy_changes:
+                if c["new_value"] is not None:
+                    rates.append(c["new_value"])
+                if c.get("calculation_details", {}).get("rule") == "taylor":
+                    taylor_applications += 1
+            
             insights.append(EconomicInsight(
                 category="Monetary Policy",
                 description="Central bank policy responses observed throughout scenario",
                 evidence={
                     "total_policy_changes": len(policy_changes),
-                    "rate_range": (
-                        min(c["new_value"] for c in policy_changes if c["new_value"] is not None),
-                        max(c["new_value"] for c in policy_changes if c["new_value"] is not None)
-                    ),
-                    "taylor_rule_applications": len([c for c in policy_changes if c.get("calculation_details", {}).get("rule") == "taylor"])
+                    "rate_range": (min(rates), max(rates)),
+                    "taylor_rule_applications": taylor_applications
                 },
                 realism_score=0.8
             ))
         
         # Crisis transmission 
-        trigger_sequence = []
-        for step in audit_trail:
-            for trigger in step["audit"]["triggers_fired"]:
-                trigger_sequence.append((step["timestep"], trigger))
+        trigger_sequence = list(zip(agg.firing_timesteps.tolist(), agg.firing_triggers))
         
         if len(trigger_sequence) > 2:
             insights.append(EconomicInsight(
@@ -580,15 +924,12 @@ class ScenarioAnalyzer:
         
         return insights
     
-    def _generate_recommendations(self, audit_trail: List[Dict]) -> List[str]:
+    def _generate_recommendations(self, agg: _AuditAggregates) -> List[str]:
         """Generate recommendations for improving simulation realism."""
         recommendations = []
         
         # Check reducer consistency
-        reducer_patterns = {}
-        for step in audit_trail:
-            sequence_key = ",".join(step["audit"]["reducer_sequence"])
-            reducer_patterns[sequence_key] = reducer_patterns.get(sequence_key, 0) + 1
+        reducer_patterns = agg.reducer_patterns
         
         if len(reducer_patterns) == 1:
             recommendations.append("✅ Reducer sequence is consistent across all timesteps")
@@ -596,19 +937,14 @@ class ScenarioAnalyzer:
             recommendations.append("⚠️ Consider investigating variable reducer sequences - may indicate inconsistent simulation logic")
         
         # Check for missing economic mechanisms
-        all_field_paths = set()
-        for step in audit_trail:
-            for change in step["audit"]["field_changes"]:
-                all_field_paths.add(change["field_path"])
-        
-        if not any("trade" in path for path in all_field_paths):
+        if not agg.seen_kinds & PATH_TRADE:
             recommendations.append("💡 Consider adding trade dynamics for more comprehensive economic modeling")
         
-        if not any("external" in path for path in all_field_paths):
+        if not agg.seen_kinds & PATH_EXTERNAL:
             recommendations.append("💡 Consider adding exchange rate and external sector dynamics")
         
         # Performance recommendations
-        avg_changes = sum(len(step["audit"]["field_changes"]) for step in audit_trail) / len(audit_trail)
+        avg_changes = agg.total_changes / agg.steps
         if avg_changes > 20:
             recommendations.append("⚡ High number of field changes per step - consider optimizing reducer efficiency")
         elif avg_changes < 3:
@@ -617,31 +953,21 @@ class ScenarioAnalyzer:
         return recommendations
     
     # Helper methods
-    def _extract_nested_value(self, data: Dict, path: str) -> Any:
-        """Extract nested value using dot notation."""
-        try:
-            current = data
-            for part in path.split("."):
-                current = current[part]
-            return current
-        except (KeyError, TypeError):
-            return None
-    
-    def _calculate_volatility(self, values: List[float]) -> float:
+    def _calculate_volatility(self, values: np.ndarray) -> float:
         """Calculate simple volatility measure."""
         if len(values) < 2:
             return 0.0
         
-        changes = [abs(values[i] - values[i-1]) for i in range(1, len(values))]
-        return sum(changes) / len(changes)
+        return mean_abs_diff(values)
     
-    def _analyze_trend(self, values: List[float]) -> str:
+    def _analyze_trend(self, values: np.ndarray) -> str:
         """Analyze trend in time series."""
         if len(values) < 3:
             return "insufficient_data"
         
-        increases = sum(1 for i in range(1, len(values)) if values[i] > values[i-1])
-        decreases = sum(1 for i in range(1, len(values)) if values[i] < values[i-1])
+        diffs = np.diff(values)
+        increases = int((diffs > 0).sum())
+        decreases = int((diffs < 0).sum())
         
         if increases > decreases * 1.5:
             return "increasing"
@@ -650,14 +976,6 @@ class ScenarioAnalyzer:
         else:
             return "stable"
     
-    def _check_reducer_consistency(self, audit_trail: List[Dict]) -> bool:
-        """Check if reducer sequences are consistent."""
-        if not audit_trail:
-            return True
-        
-        first_sequence = audit_trail[0]["audit"]["reducer_sequence"]
-        return all(step["audit"]["reducer_sequence"] == first_sequence for step in audit_trail)
-    
     def _score_to_grade(self, score: float) -> str:
         """Convert numerical score to letter grade."""
         if score >= 0.9:
@@ -684,12 +1002,22 @@ class ScenarioAnalyzer:
         else:
             return "Poor economic realism - significant improvements needed in core relationships."
     
-    def generate_detailed_report(self, audit_file: Path, output_file: Path = None) -> Path:
-        """Generate comprehensive detailed report."""
+    def generate_detailed_report(self, audit_file: Path, output_file: Path = None,
+                                 run_timestamp: str = None, pretty: bool = False) -> Path:
+        """Generate comprehensive detailed report.
+        
+        ``run_timestamp`` stamps the default file name; batches pass one
+        shared value so their reports collate together. The JSON is written
+        compact unless ``pretty`` asks for an indented file.
+        """
         analysis = self.analyze_scenario(audit_file)
         
         if output_file is None:
-            output_file = self.reports_dir / f"detailed_analysis_{analysis['scenario_name'].lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            slug = scenario_slug(analysis['scenario_name'])
+            stamp = run_timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_path = f"{self._reports_prefix}detailed_analysis_{slug}_{stamp}.json"
+        else:
+            output_path = os.fspath(output_file)
         
         # Add metadata
         analysis["analysis_metadata"] = {
@@ -698,128 +1026,153 @@ class ScenarioAnalyzer:
             "source_file": str(audit_file)
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(analysis, f, indent=2, default=str)
+        if HAS_ORJSON:
+            # NumPy arrays are written directly; dataclasses and datetimes
+            # still go through _json_default so the output matches json.dump
+            options = REPORT_ORJSON_OPTIONS | orjson.OPT_INDENT_2 if pretty else REPORT_ORJSON_OPTIONS
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(analysis, default=_json_default, option=options))
+        else:
+            # json.dump writes token by token; a large buffer coalesces them
+            with open(output_path, 'w', buffering=WRITE_BUFFER_BYTES) as f:
+                if pretty:
+                    json.dump(analysis, f, indent=2, default=_json_default)
+                else:
+                    json.dump(analysis, f, separators=(',', ':'), default=_json_default)
         
         # Generate human-readable summary
-        summary_file = output_file.with_suffix('.md')
+        summary_file = os.path.splitext(output_path)[0] + '.md'
         self._generate_markdown_summary(analysis, summary_file)
         
-        print(f"📊 Detailed analysis saved: {output_file}")
+        print(f"📊 Detailed analysis saved: {output_path}")
         print(f"📖 Summary report saved: {summary_file}")
         
-        return output_file
+        return Path(output_path)
     
-    def _generate_markdown_summary(self, analysis: Dict[str, Any], output_file: Path):
+    def _generate_markdown_summary(self, analysis: Dict[str, Any], output_file: str):
         """Generate human-readable markdown summary."""
-        content = f"""# Scenario Analysis Report: {analysis['scenario_name']}
+        # Sections are streamed through the buffer rather than held in memory
+        with open(output_file, 'w', buffering=WRITE_BUFFER_BYTES) as f:
+            self._write_markdown_summary(analysis, f.write)
+    
+    def _write_markdown_summary(self, analysis: Dict[str, Any], write: Callable[[str], Any]):
+        """Emit the markdown summary section by section through ``write``."""
+        summary = analysis['execution_summary']
+        performance = summary['performance_metrics']
+        realism = analysis['realism_assessment']
+        
+        write(f"""# Scenario Analysis Report: {analysis['scenario_name']}
 
 ## Executive Summary
-- **Overall Realism Score**: {analysis['realism_assessment']['overall_realism_score']:.2f} ({analysis['realism_assessment']['grade']})
-- **Timesteps Completed**: {analysis['execution_summary']['timesteps_completed']}
-- **Total Field Changes**: {analysis['execution_summary']['total_field_changes']}
-- **Triggers Fired**: {analysis['execution_summary']['total_triggers_fired']}
+- **Overall Realism Score**: {realism['overall_realism_score']:.2f} ({realism['grade']})
+- **Timesteps Completed**: {summary['timesteps_completed']}
+- **Total Field Changes**: {summary['total_field_changes']}
+- **Triggers Fired**: {summary['total_triggers_fired']}
 
-{analysis['realism_assessment']['summary']}
+{realism['summary']}
 
 ## Performance Metrics
-- **Execution Time**: {analysis['execution_summary']['execution_time_seconds']:.2f} seconds
-- **Average Step Time**: {analysis['execution_summary']['performance_metrics']['avg_step_time_ms']:.1f} ms
-- **Changes per Second**: {analysis['execution_summary']['performance_metrics']['changes_per_second']:.1f}
+- **Execution Time**: {summary['execution_time_seconds']:.2f} seconds
+- **Average Step Time**: {performance['avg_step_time_ms']:.1f} ms
+- **Changes per Second**: {performance['changes_per_second']:.1f}
 
 ## Economic Relationships Analysis
-"""
+""")
         
         for relationship in analysis['economic_relationships']:
-            content += f"""
-### {relationship['relationship']}
-- **Realism Score**: {relationship['realism_score']:.2f}
-- **Description**: {relationship['description']}
-- **Sample Size**: {relationship['sample_size']}
-"""
-            if relationship.get('issues'):
-                content += f"- **Issues**: {len(relationship['issues'])} identified\n"
+            write(_RELATIONSHIP_TEMPLATE.format_map(relationship))
+            issues = relationship.get('issues')
+            if issues:
+                write(f"- **Issues**: {relationship['total_issues']} identified\n")
         
-        content += f"""
+        write(f"""
 ## Key State Evolution
-"""
+""")
         
         for var, evolution in analysis['state_evolution'].items():
-            if evolution['trajectory']:
-                content += f"""
-### {var}
-- **Initial**: {evolution['initial_value']:.4f}
-- **Final**: {evolution['final_value']:.4f}
-- **Change**: {evolution['change']:.4f}
-- **Trend**: {evolution['trend']}
-"""
+            # Trajectories are {"timesteps": [...], "values": [...]} columns
+            if len(evolution['trajectory']['values']):
+                write(_EVOLUTION_TEMPLATE.format(var=var, **evolution))
         
-        content += f"""
+        write(f"""
 ## Trigger Analysis
-"""
-        
-        if analysis['trigger_analysis']['triggers_fired']:
-            for trigger_name, trigger_info in analysis['trigger_analysis']['triggers_fired'].items():
-                content += f"""
-### {trigger_name}
-- **First Fired**: Timestep {trigger_info['first_fired']}
-- **Fire Count**: {trigger_info['fire_count']}
-- **Associated Changes**: {len(trigger_info['associated_changes'])}
-"""
-        
-        content += f"""
+""")
+        
+        triggers_fired = analysis['trigger_analysis']['triggers_fired']
+        if triggers_fired:
+            for trigger_name, trigger_info in triggers_fired.items():
+                write(_TRIGGER_TEMPLATE.format(
+                    name=trigger_name,
+                    # One (step index, change index) row per associated change
+                    associated_count=len(trigger_info['associated_changes']),
+                    **trigger_info
+                ))
+        
+        write(f"""
 ## Key Insights
-"""
+""")
         
         for insight in analysis['key_insights']:
-            content += f"""
-### {insight.category}
-- **Description**: {insight.description}
-- **Realism Score**: {insight.realism_score:.2f}
-"""
+            write(_INSIGHT_TEMPLATE.format_map(vars(insight)))
         
-        content += f"""
+        write(f"""
 ## Recommendations
-"""
+""")
         
         for rec in analysis['recommendations']:
-            content += f"- {rec}\n"
+            write(f"- {rec}\n")
         
-        content += f"""
+        write(f"""
 ## Detailed Data
 For complete analysis data including field-by-field changes, see the accompanying JSON file.
 
 ---
 *Report generated at {analysis['analysis_metadata']['generated_at']}*
-"""
-        
-        with open(output_file, 'w') as f:
-            f.write(content)
+""")
+
+
+def _analyze_one(audit_file: str, run_timestamp: str, pretty: bool = False) -> Path:
+    """Process pool worker: write the detailed report for one audit file."""
+    return ScenarioAnalyzer().generate_detailed_report(
+        Path(audit_file), run_timestamp=run_timestamp, pretty=pretty
+    )
 
 
 if __name__ == "__main__":
     """Run analysis on all available audit files."""
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Analyze scenario audit trails for economic realism.")
+    parser.add_argument("audit_file", nargs="?", help="analyze only this audit file")
+    parser.add_argument("--pretty", action="store_true", help="write indented JSON reports")
+    args = parser.parse_args()
     
     analyzer = ScenarioAnalyzer()
     reports_dir = Path("reports")
     
-    if len(sys.argv) > 1:
+    if args.audit_file:
         # Analyze specific file
-        audit_file = Path(sys.argv[1])
+        audit_file = Path(args.audit_file)
         if audit_file.exists():
-            analyzer.generate_detailed_report(audit_file)
+            analyzer.generate_detailed_report(audit_file, pretty=args.pretty)
         else:
             print(f"File not found: {audit_file}")
     else:
         # Analyze all audit files
-        audit_files = list(reports_dir.glob("audit_*.json"))
+        audit_files = [*reports_dir.glob("audit_*.json"), *reports_dir.glob(f"audit_*{NDJSON_SUFFIX}")]
         if not audit_files:
             print("No audit files found in reports directory")
         else:
             print(f"Found {len(audit_files)} audit files to analyze")
-            for audit_file in audit_files:
-                try:
-                    analyzer.generate_detailed_report(audit_file)
-                except Exception as e:
-                    print(f"Error analyzing {audit_file.name}: {e}")
+            run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # Each audit is analyzed independently, one worker process per core
+            with ProcessPoolExecutor(max_workers=min(len(audit_files), os.cpu_count() or 1)) as executor:
+                futures = {
+                    executor.submit(_analyze_one, str(audit_file), run_timestamp, args.pretty): audit_file
+                    for audit_file in audit_files
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Error analyzing {futures[future].name}: {e}")
@@ -10,44 +10,89 @@ import httpx
 from datetime import datetime
 from pathlib import Path
 
+# Optional faster JSON encoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# httpx only speaks HTTP/2 when the h2 package is installed, and only
+# negotiates it over TLS; plain http:// backends stay on HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+def _loads(data: bytes):
+    """Decode JSON bytes, with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json(response: httpx.Response):
+    """Decode a JSON response body."""
+    return _loads(response.content)
+
 
 class APIAuditCapture:
-    """Capture audit trails using the real API."""
+    """Capture audit trails using the real API.
+    
+    Use as an async context manager: one pooled client is shared by every
+    request, so connections are kept alive across login, scenarios and steps.
+    """
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
         self.token = None
         self.headers = {}
+        self.client = None
+    
+    async def __aenter__(self):
+        # The API always answers in UTF-8, so skip charset detection for .text
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url, timeout=30.0, default_encoding="utf-8",
+            http2=HAS_HTTP2 and self.base_url.startswith("https://")
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
     
     async def login(self, email: str = "newuser@example.com", password: str = "testpassword123"):
         """Login and get auth token."""
-        async with httpx.AsyncClient() as client:
-            # First register user
-            try:
-                register_response = await client.post(f"{self.base_url}/api/v1/register", json={
-                    "email": email,
-                    "password": password,
-                    "full_name": "Test User"
-                })
-                print(f"Registration: {register_response.status_code}")
-            except Exception as e:
-                print(f"Registration failed (user may exist): {e}")
-            
-            # Login
-            response = await client.post(f"{self.base_url}/api/v1/login", json={
+        client = self.client
+        
+        # First register user
+        try:
+            register_response = await client.post("/api/v1/register", json={
                 "email": email,
-                "password": password
+                "password": password,
+                "full_name": "Test User"
             })
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.token = data["access_token"]
-                self.headers = {"Authorization": f"Bearer {self.token}"}
-                print("✅ Authentication successful")
-                return True
-            else:
-                print(f"❌ Login failed: {response.status_code} - {response.text}")
-                return False
+            print(f"Registration: {register_response.status_code}")
+        except Exception as e:
+            print(f"Registration failed (user may exist): {e}")
+        
+        # Login
+        response = await client.post("/api/v1/login", json={
+            "email": email,
+            "password": password
+        })
+        
+        if response.status_code == 200:
+            data = _json(response)
+            self.token = data["access_token"]
+            self.headers = {"Authorization": f"Bearer {self.token}"}
+            print("✅ Authentication successful")
+            return True
+        else:
+            print(f"❌ Login failed: {response.status_code} - {response.text}")
+            return False
     
     def get_sample_mvs_state(self):
         """Get sample MVS state for testing."""
@@ -110,119 +155,161 @@ class APIAuditCapture:
         }
     
     async def capture_scenario_audit(self, scenario_name: str, steps: int = 5):
-        """Create scenario, run steps, and capture audit trail."""
+        """Create scenario, run steps, and capture audit trail.
+        
+        ``steps`` in the result holds each step response body as raw JSON bytes.
+        """
         print(f"\n🔄 Starting audit capture for: {scenario_name}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Create scenario
-            create_data = {
-                "name": scenario_name,
-                "description": f"Audit capture test for {scenario_name}",
-                "initial_state": self.get_sample_mvs_state()
-            }
-            
-            create_response = await client.post(
-                f"{self.base_url}/api/v1/simulation/scenarios",
-                json=create_data,
-                headers=self.headers
-            )
-            
-            if create_response.status_code != 200:
-                print(f"❌ Failed to create scenario: {create_response.status_code} - {create_response.text}")
-                return None
-            
-            scenario = create_response.json()
-            scenario_id = scenario["id"]
-            print(f"✅ Created scenario: {scenario_id}")
-            
-            # Capture audit trail for each step
-            audit_trail = {
-                "scenario_id": scenario_id,
-                "scenario_name": scenario_name,
-                "description": create_data["description"],
-                "captured_at": datetime.utcnow().isoformat(),
-                "steps": []
-            }
-            
-            # Run simulation steps
+        client = self.client
+        
+        # Create scenario
+        create_data = {
+            "name": scenario_name,
+            "description": f"Audit capture test for {scenario_name}",
+            "initial_state": self.get_sample_mvs_state()
+        }
+        
+        create_response = await client.post(
+            "/api/v1/simulation/scenarios",
+            json=create_data,
+            headers=self.headers
+        )
+        
+        if create_response.status_code != 200:
+            print(f"❌ Failed to create scenario: {create_response.status_code} - {create_response.text}")
+            return None
+        
+        scenario = _json(create_response)
+        scenario_id = scenario["id"]
+        print(f"✅ Created scenario: {scenario_id}")
+        
+        # Capture audit trail for each step
+        audit_trail = {
+            "scenario_id": scenario_id,
+            "scenario_name": scenario_name,
+            "description": create_data["description"],
+            "captured_at": datetime.utcnow().isoformat(),
+            "steps": []
+        }
+        
+        # Run simulation steps. Steps are sequential on the server, but once a
+        # step has succeeded the next one is requested before this one is
+        # recorded. Step bodies are kept as the raw JSON the API sent and are
+        # spliced into the saved file, so they are never decoded and re-encoded.
+        # Progress lines are collected and written once per scenario.
+        step_url = f"/api/v1/simulation/scenarios/{scenario_id}/step"
+        next_response = asyncio.create_task(client.post(step_url, headers=self.headers))
+        log_lines = []
+        try:
             for step in range(steps):
-                print(f"   Step {step + 1}/{steps}")
-                
-                step_response = await client.post(
-                    f"{self.base_url}/api/v1/simulation/scenarios/{scenario_id}/step",
-                    headers=self.headers
-                )
+                log_lines.append(f"   Step {step + 1}/{steps}")
+                step_response = await next_response
                 
-                if step_response.status_code == 200:
-                    step_data = step_response.json()
-                    audit_trail["steps"].append({
-                        "timestep": step_data["timestep"],
-                        "state": step_data["state"],
-                        "audit": step_data["audit"],
-                        "created_at": step_data["created_at"]
-                    })
-                    print(f"   ✅ Step {step + 1} complete (timestep {step_data['timestep']})")
-                else:
-                    print(f"   ❌ Step {step + 1} failed: {step_response.status_code}")
+                if step_response.status_code != 200:
+                    log_lines.append(f"   ❌ Step {step + 1} failed: {step_response.status_code}")
                     break
-            
-            return audit_trail
+                
+                if step + 1 < steps:
+                    next_response = asyncio.create_task(client.post(step_url, headers=self.headers))
+                
+                audit_trail["steps"].append(step_response.content)
+                log_lines.append(f"   ✅ Step {step + 1} complete ({len(step_response.content)} bytes)")
+        finally:
+            if not next_response.done():
+                next_response.cancel()
+            if log_lines:
+                print("\n".join(log_lines))
+        
+        return audit_trail
     
     async def save_audit_to_file(self, audit_data: dict, filename: str):
-        """Save audit data to JSON file."""
+        """Save audit data to JSON file.
+        
+        The raw step bodies are written between the encoded header fields
+        and the closing brace, without being parsed again.
+        """
         data_dir = Path("data")
         data_dir.mkdir(exist_ok=True)
         
         filepath = data_dir / f"{filename}.json"
         
-        with open(filepath, 'w') as f:
-            json.dump(audit_data, f, indent=2, default=str)
+        header = {key: value for key, value in audit_data.items() if key != "steps"}
+        if HAS_ORJSON:
+            # Datetimes pass through to str(), as with json.dumps(default=str)
+            encoded_header = orjson.dumps(
+                header, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        else:
+            encoded_header = json.dumps(header, default=str).encode()
+        
+        with open(filepath, 'wb', buffering=1 << 20) as f:
+            # Reopen the header object and append the steps array to it
+            f.write(encoded_header[:-1])
+            f.write(b', "steps": [' if header else b'"steps": [')
+            for i, step in enumerate(audit_data["steps"]):
+                if i:
+                    f.write(b", ")
+                f.write(step)
+            f.write(b"]}")
         
         print(f"💾 Saved audit trail to: {filepath}")
         return filepath
 
 
+async def capture_and_report(capture: APIAuditCapture, scenario_name: str, steps: int,
+                             run_timestamp: str):
+    """Capture one scenario, save its audit trail and print a summary."""
+    try:
+        audit_data = await capture.capture_scenario_audit(scenario_name, steps)
+        if audit_data:
+            filename = f"audit_{scenario_name.lower()}_{run_timestamp}"
+            await capture.save_audit_to_file(audit_data, filename)
+            
+            # Print summary
+            print(f"\n📊 Audit Summary for {scenario_name}:")
+            print(f"   Scenario ID: {audit_data['scenario_id']}")
+            print(f"   Steps captured: {len(audit_data['steps'])}")
+            if audit_data['steps']:
+                # Only the two steps the summary reads are decoded
+                first_step = _loads(audit_data['steps'][0])
+                last_step = _loads(audit_data['steps'][-1])
+                print(f"   Initial timestep: {first_step['timestep']}")
+                print(f"   Final timestep: {last_step['timestep']}")
+                print(f"   Countries tracked: {list(first_step['state']['countries'].keys())}")
+            
+    except Exception as e:
+        print(f"❌ Error capturing {scenario_name}: {e}")
+    
+    print("-" * 40)
+
+
 async def main():
     """Main execution function."""
     print("🚀 SlashRun API Audit Capture")
     print("=" * 50)
     
-    capture = APIAuditCapture()
-    
-    # Login
-    if not await capture.login():
-        print("Failed to authenticate")
-        return
-    
-    # Test scenarios
-    scenarios = [
-        ("Single_Country_Basic", 3),
-        ("Policy_Shock_Scenario", 5),
-        ("Trade_War_Simulation", 4)
-    ]
-    
-    for scenario_name, steps in scenarios:
-        try:
-            audit_data = await capture.capture_scenario_audit(scenario_name, steps)
-            if audit_data:
-                filename = f"audit_{scenario_name.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                await capture.save_audit_to_file(audit_data, filename)
-                
-                # Print summary
-                print(f"\n📊 Audit Summary for {scenario_name}:")
-                print(f"   Scenario ID: {audit_data['scenario_id']}")
-                print(f"   Steps captured: {len(audit_data['steps'])}")
-                if audit_data['steps']:
-                    first_step = audit_data['steps'][0]
-                    last_step = audit_data['steps'][-1]
-                    print(f"   Initial timestep: {first_step['timestep']}")
-                    print(f"   Final timestep: {last_step['timestep']}")
-                    print(f"   Countries tracked: {list(first_step['state']['countries'].keys())}")
-                
-        except Exception as e:
-            print(f"❌ Error capturing {scenario_name}: {e}")
+    async with APIAuditCapture() as capture:
+        # Login
+        if not await capture.login():
+            print("Failed to authenticate")
+            return
+        
+        # Test scenarios
+        scenarios = [
+            ("Single_Country_Basic", 3),
+            ("Policy_Shock_Scenario", 5),
+            ("Trade_War_Simulation", 4)
+        ]
         
-        print("-" * 40)
+        # Scenarios are independent, so their API round trips overlap; each one
+        # is saved and summarized as soon as it finishes. One timestamp names
+        # every file of the batch.
+        run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        await asyncio.gather(*(
+            capture_and_report(capture, scenario_name, steps, run_timestamp)
+            for scenario_name, steps in scenarios
+        ))
     
     print("\n✅ Audit capture complete!")
 
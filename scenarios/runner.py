@@ -5,19 +5,109 @@ Loads structured YAML scenario definitions and executes with comprehensive audit
 """
 
 import asyncio
+import base64
 import json
 import yaml
 import httpx
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, asdict
+from functools import lru_cache
+import shutil
 import sys
 import os
+import random
+import tempfile
+import time
+
+from _validators import AuditIndex, EconomicValidator, ValidationResult, field_extractor, flatten
+
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Optional faster JSON encoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# httpx only speaks HTTP/2 when the h2 package is installed (httpx[http2]),
+# and only negotiates it over TLS; plain http:// backends stay on HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# Bearer tokens are reused across runs from here until shortly before they expire
+TOKEN_CACHE_FILE = Path("~/.cache/slashrun/token.json").expanduser()
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+# Transient /step failures are retried with jittered exponential backoff, up
+# to this many attempts in total. These errors and statuses mean the request
+# never reached the application, so the step cannot have been applied. A 502
+# or 504 from a proxy may come after the request was forwarded, so those are
+# read back like any other 5xx.
+STEP_MAX_ATTEMPTS = 5
+STEP_RETRY_MAX_DELAY = 8.0
+STEP_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+STEP_RETRY_STATUSES = frozenset({503})
+
+
+class StepAuditLost(Exception):
+    """A step the server applied whose response, and so its audit, was lost.
+    
+    The stored state of a step comes back without its field changes, so
+    the step cannot be recorded faithfully and the scenario fails instead.
+    """
+    
+    def __init__(self, step_number: int):
+        super().__init__(f"Step {step_number} was applied but its audit could not be recovered")
 
 # Add backend to path for imports
 sys.path.append(str(Path(__file__).parent.parent / "backend"))
 
+
+def _json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _json_line(obj: Any) -> bytes:
+    """Encode one compact NDJSON record, newline included."""
+    if HAS_ORJSON:
+        # Datetimes pass through to str(), as with json.dumps(default=str)
+        return orjson.dumps(
+            obj, default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return (json.dumps(obj, separators=(",", ":"), default=str) + "\n").encode()
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """The ``exp`` claim of a JWT, read without verifying its signature."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=128)
+def _load_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML file; cached per path and modification time."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
 @dataclass
 class ScenarioResult:
     """Results from scenario execution."""
@@ -29,375 +119,359 @@ class ScenarioResult:
     audit_trail: List[Dict[str, Any]]
     validation_results: Dict[str, Any]
     error_message: Optional[str] = None
+    # Streamed runs leave audit_trail empty; their steps are spooled here as NDJSON
+    audit_spool: Optional[Any] = None
 
-@dataclass
-class ValidationResult:
-    """Results from economic relationship validation."""
-    check_name: str
-    description: str
-    passed: bool
-    details: Dict[str, Any]
-    error_message: Optional[str] = None
 
-class EconomicValidator:
-    """Validates economic relationships and realism."""
-    
-    def __init__(self):
-        self.tolerance = 0.001
-    
-    def validate_relationship(self, check_name: str, description: str, 
-                            audit_trail: List[Dict], initial_state: Dict) -> ValidationResult:
-        """Validate a specific economic relationship."""
-        try:
-            if check_name == "policy_rate_adjusts_for_inflation":
-                return self._validate_taylor_rule_response(audit_trail, initial_state)
-            elif check_name == "inflation_changes_over_time":
-                return self._validate_inflation_evolution(audit_trail, initial_state)
-            elif check_name == "trigger_fires_on_schedule":
-                return self._validate_trigger_timing(audit_trail, description)
-            elif check_name == "tariffs_increase_over_time":
-                return self._validate_tariff_escalation(audit_trail)
-            elif check_name == "fx_rate_increases_in_crisis":
-                return self._validate_currency_devaluation(audit_trail)
-            elif check_name == "credit_spreads_widen_with_bank_stress":
-                return self._validate_credit_spread_widening(audit_trail)
-            else:
-                return ValidationResult(
-                    check_name=check_name,
-                    description=description,
-                    passed=False,
-                    details={},
-                    error_message=f"Unknown validation check: {check_name}"
-                )
-        except Exception as e:
-            return ValidationResult(
-                check_name=check_name,
-                description=description, 
-                passed=False,
-                details={},
-                error_message=f"Validation error: {str(e)}"
-            )
+class EnhancedScenarioRunner:
+    """Enhanced scenario runner with comprehensive audit capture.
     
-    def _validate_taylor_rule_response(self, audit_trail: List[Dict], initial_state: Dict) -> ValidationResult:
-        """Validate that policy rate responds to inflation gap."""
-        if len(audit_trail) < 2:
-            return ValidationResult("policy_rate_adjusts_for_inflation", "Taylor rule response", False, 
-                                  {}, "Insufficient timesteps for validation")
-        
-        initial_inflation = initial_state["countries"]["USA"]["macro"]["inflation"]
-        initial_rate = initial_state["countries"]["USA"]["macro"]["policy_rate"]
-        target_inflation = initial_state["countries"]["USA"]["macro"].get("inflation_target", 0.02)
-        
-        final_step = audit_trail[-1]
-        final_inflation = final_step["state"]["countries"]["USA"]["macro"]["inflation"]
-        final_rate = final_step["state"]["countries"]["USA"]["macro"]["policy_rate"]
-        
-        initial_gap = initial_inflation - target_inflation
-        final_gap = final_inflation - target_inflation
-        
-        # Check if rate moved in correct direction
-        if initial_gap > 0:  # Above target inflation
-            rate_should_increase = final_rate > initial_rate - self.tolerance
-        else:  # Below target inflation
-            rate_should_increase = final_rate < initial_rate + self.tolerance
-        
-        return ValidationResult(
-            check_name="policy_rate_adjusts_for_inflation",
-            description="Taylor rule response",
-            passed=rate_should_increase,
-            details={
-                "initial_inflation": initial_inflation,
-                "final_inflation": final_inflation,
-                "initial_rate": initial_rate,
-                "final_rate": final_rate,
-                "initial_gap": initial_gap,
-                "final_gap": final_gap,
-                "target_inflation": target_inflation
-            }
-        )
+    Use as an async context manager: one pooled client is shared by login,
+    scenario creation and every step, so connections are kept alive.
+    """
     
-    def _validate_inflation_evolution(self, audit_trail: List[Dict], initial_state: Dict) -> ValidationResult:
-        """Validate that inflation changes over time."""
-        if len(audit_trail) < 2:
-            return ValidationResult("inflation_changes_over_time", "Inflation evolution", False,
-                                  {}, "Insufficient timesteps for validation")
-        
-        initial_inflation = initial_state["countries"]["USA"]["macro"]["inflation"]
-        final_inflation = audit_trail[-1]["state"]["countries"]["USA"]["macro"]["inflation"]
-        
-        changed = abs(final_inflation - initial_inflation) > self.tolerance
-        
-        return ValidationResult(
-            check_name="inflation_changes_over_time",
-            description="Inflation evolution",
-            passed=changed,
-            details={
-                "initial_inflation": initial_inflation,
-                "final_inflation": final_inflation,
-                "change": final_inflation - initial_inflation
-            }
-        )
+    def __init__(self, base_url: str = "http://localhost:8000", keep_audit_trail: bool = False,
+                 token_cache: Optional[Path] = TOKEN_CACHE_FILE):
+        self.base_url = base_url
+        # None disables reusing tokens across runs
+        self.token_cache = token_cache
+        self.token = None
+        self.headers = {}
+        # (email, password) while the token in use came from the cache, so a
+        # rejected token can be replaced by a fresh login
+        self._cached_login = None
+        self._relogin_lock = asyncio.Lock()
+        self.validator = EconomicValidator()
+        self.client = None
+        # By default steps are validated as they arrive and spooled to disk;
+        # keep_audit_trail also holds every step in ScenarioResult.audit_trail
+        self.keep_audit_trail = keep_audit_trail
     
-    def _validate_trigger_timing(self, audit_trail: List[Dict], description: str) -> ValidationResult:
-        """Validate that trigger fires at expected time."""
-        trigger_fired = False
-        fire_timestep = None
-        
-        for step in audit_trail:
-            if step["audit"]["triggers_fired"]:
-                trigger_fired = True
-                fire_timestep = step["timestep"]
-                break
-        
-        return ValidationResult(
-            check_name="trigger_fires_on_schedule",
-            description=description,
-            passed=trigger_fired,
-            details={
-                "trigger_fired": trigger_fired,
-                "fire_timestep": fire_timestep,
-                "expected_timestep": "varies by scenario"
-            }
+    async def __aenter__(self):
+        # Against an HTTPS backend with h2 installed, the step requests of
+        # concurrent scenarios are multiplexed over a few HTTP/2 connections;
+        # otherwise they share the pool's HTTP/1.1 keep-alive connections
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=60.0,
+            http2=HAS_HTTP2 and self.base_url.startswith("https://"),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=32),
         )
+        return self
     
-    def _validate_tariff_escalation(self, audit_trail: List[Dict]) -> ValidationResult:
-        """Validate tariff escalation pattern."""
-        us_tariffs = []
-        chn_tariffs = []
-        
-        for step in audit_trail:
-            state = step["state"]
-            if "USA" in state["countries"] and "trade" in state["countries"]["USA"]:
-                us_tariffs.append(state["countries"]["USA"]["trade"]["tariff_mfn_avg"])
-            if "CHN" in state["countries"] and "trade" in state["countries"]["CHN"]:
-                chn_tariffs.append(state["countries"]["CHN"]["trade"]["tariff_mfn_avg"])
-        
-        us_escalated = len(us_tariffs) > 1 and max(us_tariffs) > min(us_tariffs) + 0.1
-        chn_escalated = len(chn_tariffs) > 1 and max(chn_tariffs) > min(chn_tariffs) + 0.1
-        
-        return ValidationResult(
-            check_name="tariffs_increase_over_time",
-            description="Tariff escalation",
-            passed=us_escalated or chn_escalated,
-            details={
-                "us_tariff_range": (min(us_tariffs), max(us_tariffs)) if us_tariffs else None,
-                "chn_tariff_range": (min(chn_tariffs), max(chn_tariffs)) if chn_tariffs else None,
-                "us_escalated": us_escalated,
-                "chn_escalated": chn_escalated
-            }
-        )
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+        
+    def _use_token(self, token: str):
+        self.token = token
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+        # Every later request on the shared client carries the token
+        self.client.headers.update(self.headers)
     
-    def _validate_currency_devaluation(self, audit_trail: List[Dict]) -> ValidationResult:
-        """Validate currency devaluation during crisis."""
-        fx_rates = []
-        
-        for step in audit_trail:
-            state = step["state"]
-            for country_code, country_data in state["countries"].items():
-                if "external" in country_data and "fx_rate" in country_data["external"]:
-                    fx_rate = country_data["external"]["fx_rate"]
-                    if country_code != "USA":  # Non-USD currencies
-                        fx_rates.append((step["timestep"], country_code, fx_rate))
-        
-        # Look for significant devaluation (FX rate increase for non-USD)
-        devaluation_found = False
-        for i in range(1, len(fx_rates)):
-            if fx_rates[i][2] > fx_rates[0][2] * 1.1:  # 10%+ devaluation
-                devaluation_found = True
-                break
-        
-        return ValidationResult(
-            check_name="fx_rate_increases_in_crisis",
-            description="Currency devaluation",
-            passed=devaluation_found,
-            details={
-                "fx_rate_series": fx_rates,
-                "devaluation_found": devaluation_found
-            }
-        )
+    def _load_cached_token(self, email: str) -> Optional[str]:
+        """A cached token for this server and user that is still valid, if any."""
+        try:
+            cached = json.loads(self.token_cache.read_text())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(cached, dict)
+            or cached.get("base_url") != self.base_url
+            or cached.get("email") != email
+            or not isinstance(cached.get("exp"), (int, float))
+            or cached["exp"] <= time.time() + TOKEN_EXPIRY_MARGIN_SECONDS
+        ):
+            return None
+        return cached.get("token")
     
-    def _validate_credit_spread_widening(self, audit_trail: List[Dict]) -> ValidationResult:
-        """Validate credit spread widening during financial stress."""
-        spreads = []
-        
-        for step in audit_trail:
-            state = step["state"]
-            for country_code, country_data in state["countries"].items():
-                if "finance" in country_data and "credit_spread" in country_data["finance"]:
-                    spread = country_data["finance"]["credit_spread"]
-                    spreads.append((step["timestep"], country_code, spread))
-        
-        # Look for significant spread widening
-        widening_found = False
-        if len(spreads) > 1:
-            max_spread = max(spreads, key=lambda x: x[2])
-            min_spread = min(spreads, key=lambda x: x[2])
-            if max_spread[2] > min_spread[2] * 1.5:  # 50%+ widening
-                widening_found = True
-        
-        return ValidationResult(
-            check_name="credit_spreads_widen_with_bank_stress",
-            description="Credit spread widening",
-            passed=widening_found,
-            details={
-                "spread_series": spreads,
-                "widening_found": widening_found,
-                "max_spread": max(spreads, key=lambda x: x[2]) if spreads else None,
-                "min_spread": min(spreads, key=lambda x: x[2]) if spreads else None
-            }
-        )
-
-class EnhancedScenarioRunner:
-    """Enhanced scenario runner with comprehensive audit capture."""
+    def _store_cached_token(self, email: str, token: str):
+        """Save a token for later runs, readable only by the current user."""
+        exp = _jwt_expiry(token)
+        if exp is None:
+            return
+        try:
+            self.token_cache.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.token_cache.with_name(f"{self.token_cache.name}.{os.getpid()}.tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"base_url": self.base_url, "email": email, "token": token, "exp": exp}, f)
+            os.chmod(tmp_file, 0o600)
+            tmp_file.replace(self.token_cache)
+        except OSError as e:
+            print(f"Could not cache token: {e}")
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
-        self.base_url = base_url
-        self.token = None
-        self.headers = {}
-        self.validator = EconomicValidator()
-        
     async def login(self, email: str = "newuser@example.com", password: str = "testpassword123"):
-        """Login and get auth token."""
-        async with httpx.AsyncClient() as client:
-            # First register user
-            try:
-                register_response = await client.post(f"{self.base_url}/api/v1/register", json={
-                    "email": email,
-                    "password": password,
-                    "full_name": "Test User"
-                })
-                print(f"Registration: {register_response.status_code}")
-            except Exception as e:
-                print(f"Registration failed (user may exist): {e}")
-            
-            # Login
-            response = await client.post(f"{self.base_url}/api/v1/login", json={
+        """Login and get auth token.
+        
+        A token cached by an earlier run for the same server and user is
+        reused while it is valid, skipping registration and login.
+        """
+        client = self.client
+        
+        if self.token_cache is not None:
+            token = self._load_cached_token(email)
+            if token:
+                self._use_token(token)
+                self._cached_login = (email, password)
+                print("✅ Authentication successful (cached token)")
+                return True
+        
+        # First register user
+        try:
+            register_response = await client.post("/api/v1/register", json={
                 "email": email,
-                "password": password
+                "password": password,
+                "full_name": "Test User"
             })
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.token = data["access_token"]
-                self.headers = {"Authorization": f"Bearer {self.token}"}
-                print("✅ Authentication successful")
-                return True
-            else:
-                print(f"❌ Login failed: {response.status_code} - {response.text}")
-                return False
+            print(f"Registration: {register_response.status_code}")
+        except Exception as e:
+            print(f"Registration failed (user may exist): {e}")
+        
+        # Login
+        response = await client.post("/api/v1/login", json={
+            "email": email,
+            "password": password
+        })
+        
+        if response.status_code == 200:
+            data = _json(response)
+            self._use_token(data["access_token"])
+            self._cached_login = None
+            if self.token_cache is not None:
+                self._store_cached_token(email, self.token)
+            print("✅ Authentication successful")
+            return True
+        else:
+            print(f"❌ Login failed: {response.status_code} - {response.text}")
+            return False
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send an authenticated request on the shared client.
+        
+        A cached token the server rejects with 401 (e.g. after a database
+        reset) is dropped from the cache, replaced by one fresh login and the
+        request is sent once more. Concurrent scenarios share that login.
+        """
+        token = self.token
+        response = await self.client.request(method, url, **kwargs)
+        if response.status_code != 401 or self._cached_login is None:
+            return response
+        async with self._relogin_lock:
+            # Another scenario may have replaced the token already
+            if self.token == token and self._cached_login is not None:
+                email, password = self._cached_login
+                self._cached_login = None
+                print("🔑 Cached token rejected, logging in again")
+                self.token_cache.unlink(missing_ok=True)
+                await self.login(email, password)
+        if self.token == token:
+            return response
+        return await self.client.request(method, url, **kwargs)
     
     def load_scenario_definition(self, scenario_path: Path) -> Dict[str, Any]:
-        """Load scenario definition from YAML file."""
-        with open(scenario_path, 'r') as f:
-            return yaml.safe_load(f)
+        """Load scenario definition from YAML file.
+        
+        Definitions are cached until the file changes; treat them as read-only.
+        """
+        return _load_yaml(str(scenario_path), scenario_path.stat().st_mtime_ns)
+    
+    async def _step_applied(self, scenario_id: str, timestep: int) -> bool:
+        """Whether the server has already applied the step from ``timestep``.
+        
+        Raises httpx.HTTPError, or KeyError/ValueError for an unexpected
+        body, when the scenario cannot be read.
+        """
+        response = await self._request("GET", f"/api/v1/simulation/scenarios/{scenario_id}")
+        response.raise_for_status()
+        return _json(response)["current_timestep"] > timestep
+    
+    async def _post_step(self, scenario_id: str, timestep: int, step_number: int,
+                         log_lines: List[str]) -> httpx.Response:
+        """POST one simulation step from ``timestep``, retrying transient failures.
+        
+        The step endpoint is not idempotent. Failures where the request never
+        reached the application (connection errors, 503) are retried
+        directly. After any other 5xx or transport error the scenario is
+        read back first: if the step was applied, StepAuditLost is raised
+        instead of stepping again, since the step's audit is gone with the
+        response; if that cannot be checked the failure is returned (or
+        raised) without a retry. Other responses are returned as is.
+        """
+        step_url = f"/api/v1/simulation/scenarios/{scenario_id}/step"
+        for attempt in range(STEP_MAX_ATTEMPTS):
+            last_attempt = attempt + 1 == STEP_MAX_ATTEMPTS
+            try:
+                response = await self._request("POST", step_url)
+            except STEP_RETRY_ERRORS as e:
+                if last_attempt:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                try:
+                    applied = await self._step_applied(scenario_id, timestep)
+                except (httpx.HTTPError, KeyError, ValueError):
+                    raise e
+                if applied:
+                    raise StepAuditLost(step_number) from e
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                status = response.status_code
+                if status < 500 or last_attempt:
+                    return response
+                if status not in STEP_RETRY_STATUSES:
+                    try:
+                        applied = await self._step_applied(scenario_id, timestep)
+                    except (httpx.HTTPError, KeyError, ValueError):
+                        return response
+                    if applied:
+                        raise StepAuditLost(step_number)
+                reason = str(status)
+            delay = min(2 ** attempt, STEP_RETRY_MAX_DELAY) + random.random() * 0.25
+            log_lines.append(
+                f"     ⚠️ Step {step_number} failed ({reason}), retrying in {delay:.1f}s "
+                f"({attempt + 1}/{STEP_MAX_ATTEMPTS})"
+            )
+            await asyncio.sleep(delay)
     
     async def execute_scenario(self, scenario_def: Dict[str, Any]) -> ScenarioResult:
         """Execute a scenario with comprehensive tracking."""
         scenario_name = scenario_def["name"]
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         print(f"\n🔄 Executing scenario: {scenario_name}")
         print(f"   Description: {scenario_def['description']}")
         print(f"   Complexity: {scenario_def['complexity']}")
         print(f"   Expected duration: {scenario_def['expected_duration']} timesteps")
         
+        audit_spool = None
+        log_lines = []
+        
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                # Create scenario
-                create_data = {
-                    "name": scenario_name,
-                    "description": scenario_def["description"],
-                    "initial_state": scenario_def["initial_state"],
-                    "triggers": scenario_def.get("triggers", [])
-                }
-                
-                create_response = await client.post(
-                    f"{self.base_url}/api/v1/simulation/scenarios",
-                    json=create_data,
-                    headers=self.headers
+            # Create scenario
+            create_data = {
+                "name": scenario_name,
+                "description": scenario_def["description"],
+                "initial_state": scenario_def["initial_state"],
+                "triggers": scenario_def.get("triggers", [])
+            }
+            
+            create_response = await self._request("POST", "/api/v1/simulation/scenarios", json=create_data)
+            
+            if create_response.status_code != 200:
+                return ScenarioResult(
+                    scenario_name=scenario_name,
+                    scenario_id="",
+                    success=False,
+                    timesteps_completed=0,
+                    execution_time=0,
+                    audit_trail=[],
+                    validation_results={},
+                    error_message=f"Failed to create scenario: {create_response.status_code} - {create_response.text}"
                 )
+            
+            scenario = _json(create_response)
+            scenario_id = scenario["id"]
+            print(f"✅ Created scenario: {scenario_id}")
+            
+            # Execute timesteps with detailed tracking. Each step is folded into
+            # the index the validators read, then kept or spooled to disk.
+            # Progress lines are collected and written once per scenario, so
+            # concurrent scenarios don't interleave or contend for stdout.
+            outcomes = scenario_def.get("validation", {}).get("expected_outcomes", [])
+            index = AuditIndex(field_paths=tuple(dict.fromkeys(outcome["field"] for outcome in outcomes)))
+            audit_trail = []
+            if not self.keep_audit_trail:
+                audit_spool = tempfile.TemporaryFile(buffering=1 << 20)
+            timesteps = scenario_def.get("test_parameters", {}).get("timesteps", scenario_def["expected_duration"])
+            
+            # Server-side timestep the next step starts from
+            current_timestep = scenario.get("current_timestep", 0)
+            for timestep in range(timesteps):
+                log_lines.append(f"   Step {timestep + 1}/{timesteps}")
                 
-                if create_response.status_code != 200:
+                try:
+                    step_response = await self._post_step(scenario_id, current_timestep, timestep + 1, log_lines)
+                    error_message = None if step_response.status_code == 200 else \
+                        f"Step {timestep + 1} failed: {step_response.status_code}"
+                except StepAuditLost as e:
+                    error_message = str(e)
+                
+                if error_message is None:
+                    step_data = _json(step_response)
+                    current_timestep = step_data["timestep"]
+                    index.observe(step_data)
+                    if audit_spool is None:
+                        audit_trail.append(step_data)
+                    else:
+                        audit_spool.write(_json_line(step_data))
+                    
+                    # Print step summary
+                    triggers_fired = step_data["audit"]["triggers_fired"]
+                    field_changes = len(step_data["audit"]["field_changes"])
+                    reducer_sequence = step_data["audit"]["reducer_sequence"]
+                    
+                    log_lines.append(f"     ✅ Timestep {step_data['timestep']}: {field_changes} changes, {len(reducer_sequence)} reducers")
+                    if triggers_fired:
+                        log_lines.append(f"     🔥 Triggers fired: {triggers_fired}")
+                else:
                     return ScenarioResult(
                         scenario_name=scenario_name,
-                        scenario_id="",
+                        scenario_id=scenario_id,
                         success=False,
-                        timesteps_completed=0,
-                        execution_time=0,
-                        audit_trail=[],
+                        timesteps_completed=timestep,
+                        execution_time=time.perf_counter() - start_time,
+                        audit_trail=audit_trail,
                         validation_results={},
-                        error_message=f"Failed to create scenario: {create_response.status_code} - {create_response.text}"
+                        error_message=error_message,
+                        audit_spool=audit_spool
                     )
-                
-                scenario = create_response.json()
-                scenario_id = scenario["id"]
-                print(f"✅ Created scenario: {scenario_id}")
-                
-                # Execute timesteps with detailed tracking
-                audit_trail = []
-                timesteps = scenario_def.get("test_parameters", {}).get("timesteps", scenario_def["expected_duration"])
-                
-                for timestep in range(timesteps):
-                    print(f"   Step {timestep + 1}/{timesteps}")
-                    
-                    step_response = await client.post(
-                        f"{self.base_url}/api/v1/simulation/scenarios/{scenario_id}/step",
-                        headers=self.headers
-                    )
-                    
-                    if step_response.status_code == 200:
-                        step_data = step_response.json()
-                        audit_trail.append(step_data)
-                        
-                        # Print step summary
-                        triggers_fired = step_data["audit"]["triggers_fired"]
-                        field_changes = len(step_data["audit"]["field_changes"])
-                        reducer_sequence = step_data["audit"]["reducer_sequence"]
-                        
-                        print(f"     ✅ Timestep {step_data['timestep']}: {field_changes} changes, {len(reducer_sequence)} reducers")
-                        if triggers_fired:
-                            print(f"     🔥 Triggers fired: {triggers_fired}")
-                    else:
-                        return ScenarioResult(
-                            scenario_name=scenario_name,
-                            scenario_id=scenario_id,
-                            success=False,
-                            timesteps_completed=timestep,
-                            execution_time=(datetime.utcnow() - start_time).total_seconds(),
-                            audit_trail=audit_trail,
-                            validation_results={},
-                            error_message=f"Step {timestep + 1} failed: {step_response.status_code}"
-                        )
-                
-                # Perform validation
-                validation_results = await self.validate_scenario(scenario_def, audit_trail)
-                
-                execution_time = (datetime.utcnow() - start_time).total_seconds()
-                
-                return ScenarioResult(
-                    scenario_name=scenario_name,
-                    scenario_id=scenario_id,
-                    success=True,
-                    timesteps_completed=len(audit_trail),
-                    execution_time=execution_time,
-                    audit_trail=audit_trail,
-                    validation_results=validation_results
-                )
-                
+            
+            # Perform validation
+            validation_results = await self.validate_scenario(scenario_def, index)
+            
+            execution_time = time.perf_counter() - start_time
+            
+            return ScenarioResult(
+                scenario_name=scenario_name,
+                scenario_id=scenario_id,
+                success=True,
+                timesteps_completed=index.steps,
+                execution_time=execution_time,
+                audit_trail=audit_trail,
+                validation_results=validation_results,
+                audit_spool=audit_spool
+            )
+            
         except Exception as e:
+            if audit_spool is not None:
+                audit_spool.close()
             return ScenarioResult(
                 scenario_name=scenario_name,
                 scenario_id="",
                 success=False,
                 timesteps_completed=0,
-                execution_time=(datetime.utcnow() - start_time).total_seconds(),
+                execution_time=time.perf_counter() - start_time,
                 audit_trail=[],
                 validation_results={},
                 error_message=f"Execution error: {str(e)}"
             )
+        finally:
+            if log_lines:
+                print("\n".join(log_lines))
+    
+    async def validate_scenario(self, scenario_def: Dict[str, Any], index: AuditIndex) -> Dict[str, Any]:
+        """Validate scenario results against expected outcomes.
+        
+        ``index`` must track the field of every expected outcome. The checks
+        run on a worker thread, so other scenarios' requests keep flowing.
+        """
+        return await asyncio.to_thread(self._validate_sync, scenario_def, index)
     
-    async def validate_scenario(self, scenario_def: Dict[str, Any], audit_trail: List[Dict]) -> Dict[str, Any]:
-        """Validate scenario results against expected outcomes."""
+    def _validate_sync(self, scenario_def: Dict[str, Any], index: AuditIndex) -> Dict[str, Any]:
+        """Blocking body of validate_scenario."""
         validation_config = scenario_def.get("validation", {})
         results = {
             "economic_relationships": [],
@@ -405,6 +479,10 @@ class EnhancedScenarioRunner:
             "overall_passed": True
         }
         
+        # The initial state is flattened once for every check and outcome
+        initial_state = scenario_def["initial_state"]
+        flat_initial = flatten(initial_state)
+        
         # Validate economic relationships
         relationships = validation_config.get("economic_relationships", [])
         for relationship in relationships:
@@ -412,7 +490,7 @@ class EnhancedScenarioRunner:
             description = relationship["description"]
             
             validation_result = self.validator.validate_relationship(
-                check_name, description, audit_trail, scenario_def["initial_state"]
+                check_name, description, None, initial_state, index, flat_initial
             )
             
             results["economic_relationships"].append(asdict(validation_result))
@@ -422,28 +500,37 @@ class EnhancedScenarioRunner:
         # Validate expected outcomes
         outcomes = validation_config.get("expected_outcomes", [])
         for outcome in outcomes:
-            outcome_result = self.validate_expected_outcome(outcome, audit_trail, scenario_def["initial_state"])
+            outcome_result = self.validate_expected_outcome(outcome, index, initial_state, flat_initial)
             results["expected_outcomes"].append(outcome_result)
             if not outcome_result["passed"]:
                 results["overall_passed"] = False
         
         return results
     
-    def validate_expected_outcome(self, outcome: Dict[str, Any], audit_trail: List[Dict], initial_state: Dict) -> Dict[str, Any]:
-        """Validate a specific expected outcome."""
+    def validate_expected_outcome(self, outcome: Dict[str, Any], audit_trail: Union[AuditIndex, List[Dict]],
+                                  initial_state: Dict,
+                                  flat_initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Validate a specific expected outcome.
+        
+        ``audit_trail`` is an AuditIndex tracking the outcome's field, or a
+        list of steps as in earlier versions. ``flat_initial`` is
+        ``flatten(initial_state)``, computed if omitted.
+        """
         field_path = outcome["field"]
         should = outcome["should"]
         
         try:
-            # Extract field values over time
-            field_values = []
-            for step in audit_trail:
-                value = self.extract_field_value(step, field_path)
-                if value is not None:
-                    field_values.append((step["timestep"], value))
+            # Field values over time
+            index = audit_trail
+            if not isinstance(index, AuditIndex):
+                index = AuditIndex.from_audit_trail(audit_trail, (field_path,))
+            field_values = index.field_values[field_path]
             
             # Get initial value
-            initial_value = self.extract_field_value({"state": initial_state}, field_path)
+            if flat_initial is None:
+                flat_initial = flatten(initial_state)
+            # The initial state has no audit section
+            initial_value = None if field_path.startswith("audit.") else flat_initial.get(field_path)
             
             # Validate based on expectation
             if should == "change":
@@ -501,60 +588,68 @@ class EnhancedScenarioRunner:
     
     def extract_field_value(self, step_data: Dict, field_path: str) -> Any:
         """Extract a field value from step data using dot notation."""
-        try:
-            # Handle audit fields
-            if field_path.startswith("audit."):
-                audit_field = field_path[6:]  # Remove "audit."
-                return step_data["audit"].get(audit_field)
-            
-            # Handle state fields
-            parts = field_path.split(".")
-            current = step_data["state"]
-            
-            for part in parts:
-                if isinstance(current, dict):
-                    current = current.get(part)
-                else:
-                    return None
-            
-            return current
-        except:
-            return None
+        return field_extractor(field_path)(step_data)
     
     async def save_results(self, result: ScenarioResult, output_dir: Path):
-        """Save scenario results to files."""
+        """Save scenario results to files.
+        
+        Encoding and writing run on a worker thread, off the event loop.
+        """
+        audit_file, validation_file = await asyncio.to_thread(self._write_results, result, output_dir)
+        
+        print(f"💾 Results saved:")
+        print(f"   Audit trail: {audit_file}")
+        print(f"   Validation report: {validation_file}")
+        
+        return audit_file, validation_file
+    
+    def _write_results(self, result: ScenarioResult, output_dir: Path) -> tuple:
+        """Blocking body of save_results; returns the audit and validation paths."""
         output_dir.mkdir(exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Save detailed audit trail
-        audit_file = output_dir / f"audit_{result.scenario_name.lower().replace(' ', '_')}_{timestamp}.json"
-        with open(audit_file, 'w') as f:
-            json.dump({
+        # Save detailed audit trail as NDJSON: a header record, then one
+        # record per timestep, each encoded and written on its own
+        audit_file = output_dir / f"audit_{result.scenario_name.lower().replace(' ', '_')}_{timestamp}.ndjson"
+        with open(audit_file, 'wb', buffering=1 << 20) as f:
+            f.write(_json_line({
                 "scenario_name": result.scenario_name,
                 "scenario_id": result.scenario_id,
                 "execution_time": result.execution_time,
                 "timesteps_completed": result.timesteps_completed,
-                "audit_trail": result.audit_trail,
                 "captured_at": datetime.utcnow().isoformat()
-            }, f, indent=2, default=str)
+            }))
+            if result.audit_spool is not None:
+                # Steps were encoded as they arrived; copy them over in blocks
+                result.audit_spool.seek(0)
+                shutil.copyfileobj(result.audit_spool, f, 1 << 20)
+                result.audit_spool.close()
+                result.audit_spool = None
+            for step in result.audit_trail:
+                f.write(_json_line(step))
         
         # Save validation report
         validation_file = output_dir / f"validation_{result.scenario_name.lower().replace(' ', '_')}_{timestamp}.json"
-        with open(validation_file, 'w') as f:
-            json.dump({
-                "scenario_name": result.scenario_name,
-                "success": result.success,
-                "validation_results": result.validation_results,
-                "error_message": result.error_message,
-                "execution_summary": {
-                    "timesteps_completed": result.timesteps_completed,
-                    "execution_time": result.execution_time
-                }
-            }, f, indent=2, default=str)
-        
-        print(f"💾 Results saved:")
-        print(f"   Audit trail: {audit_file}")
-        print(f"   Validation report: {validation_file}")
+        validation_report = {
+            "scenario_name": result.scenario_name,
+            "success": result.success,
+            "validation_results": result.validation_results,
+            "error_message": result.error_message,
+            "execution_summary": {
+                "timesteps_completed": result.timesteps_completed,
+                "execution_time": result.execution_time
+            }
+        }
+        # This small report is meant to be read, so it stays indented
+        if HAS_ORJSON:
+            with open(validation_file, 'wb') as f:
+                f.write(orjson.dumps(
+                    validation_report, default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                ))
+        else:
+            with open(validation_file, 'w') as f:
+                json.dump(validation_report, f, indent=2, default=str)
         
         return audit_file, validation_file
 
@@ -568,73 +663,84 @@ async def main():
     print("🚀 Enhanced SlashRun Scenario Runner")
     print("=" * 50)
     
-    runner = EnhancedScenarioRunner()
-    
-    # Login
-    if not await runner.login():
-        print("❌ Failed to authenticate")
-        return
-    
-    # Find scenario files
-    definitions_dir = Path(__file__).parent / "definitions"
-    scenario_files = []
-    
-    for complexity in ["simple", "medium", "complex"]:
-        complexity_dir = definitions_dir / complexity
-        if complexity_dir.exists():
-            if scenario_filter == "all" or scenario_filter == complexity:
-                scenario_files.extend(list(complexity_dir.glob("*.yaml")))
-    
-    if not scenario_files:
-        print(f"❌ No scenario files found for filter: {scenario_filter}")
-        return
-    
-    print(f"📋 Found {len(scenario_files)} scenarios to execute")
-    
-    # Execute scenarios
-    results = []
-    for scenario_file in scenario_files:
-        try:
-            scenario_def = runner.load_scenario_definition(scenario_file)
-            result = await runner.execute_scenario(scenario_def)
-            results.append(result)
-            
-            # Save results
-            reports_dir = Path(__file__).parent / "reports"
-            await runner.save_results(result, reports_dir)
-            
-            # Print summary
-            print(f"\n📊 Scenario Summary: {result.scenario_name}")
-            print(f"   Success: {'✅' if result.success else '❌'}")
-            print(f"   Timesteps: {result.timesteps_completed}")
-            print(f"   Execution time: {result.execution_time:.2f}s")
-            if result.validation_results:
-                overall_passed = result.validation_results.get("overall_passed", False)
-                print(f"   Validation: {'✅' if overall_passed else '❌'}")
-                
-                # Show failed validations
-                for rel in result.validation_results.get("economic_relationships", []):
-                    if not rel["passed"]:
-                        print(f"     ❌ {rel['check_name']}: {rel.get('error_message', 'Failed')}")
-                
-                for outcome in result.validation_results.get("expected_outcomes", []):
-                    if not outcome["passed"]:
-                        print(f"     ❌ {outcome['field']}: Expected {outcome['should']}")
-            
-            if result.error_message:
-                print(f"   Error: {result.error_message}")
-            
-            print("-" * 40)
-            
-        except Exception as e:
-            print(f"❌ Error executing {scenario_file.name}: {e}")
-    
-    # Final summary
-    successful_scenarios = [r for r in results if r.success]
-    print(f"\n✅ Execution complete!")
-    print(f"   Total scenarios: {len(results)}")
-    print(f"   Successful: {len(successful_scenarios)}")
-    print(f"   Failed: {len(results) - len(successful_scenarios)}")
+    async with EnhancedScenarioRunner() as runner:
+        # Login
+        if not await runner.login():
+            print("❌ Failed to authenticate")
+            return
+        
+        # Find scenario files
+        definitions_dir = Path(__file__).parent / "definitions"
+        scenario_files = []
+        
+        for complexity in ["simple", "medium", "complex"]:
+            complexity_dir = definitions_dir / complexity
+            if complexity_dir.exists():
+                if scenario_filter == "all" or scenario_filter == complexity:
+                    scenario_files.extend(list(complexity_dir.glob("*.yaml")))
+        
+        if not scenario_files:
+            print(f"❌ No scenario files found for filter: {scenario_filter}")
+            return
+        
+        print(f"📋 Found {len(scenario_files)} scenarios to execute")
+        
+        # Execute scenarios. They are independent on the server, so up to
+        # SCENARIO_CONCURRENCY of them run at once over the shared client.
+        # Each result is saved and summarized as soon as its scenario finishes;
+        # nothing awaits between the save and its summary, so summaries do
+        # not interleave.
+        reports_dir = Path(__file__).parent / "reports"
+        semaphore = asyncio.Semaphore(int(os.getenv("SCENARIO_CONCURRENCY", "8")))
+        
+        async def run_one(scenario_file: Path) -> Optional[ScenarioResult]:
+            async with semaphore:
+                try:
+                    scenario_def = runner.load_scenario_definition(scenario_file)
+                    result = await runner.execute_scenario(scenario_def)
+                    
+                    # Save results
+                    await runner.save_results(result, reports_dir)
+                    
+                    # Print summary
+                    print(f"\n📊 Scenario Summary: {result.scenario_name}")
+                    print(f"   Success: {'✅' if result.success else '❌'}")
+                    print(f"   Timesteps: {result.timesteps_completed}")
+                    print(f"   Execution time: {result.execution_time:.2f}s")
+                    if result.validation_results:
+                        overall_passed = result.validation_results.get("overall_passed", False)
+                        print(f"   Validation: {'✅' if overall_passed else '❌'}")
+                        
+                        # Show failed validations
+                        for rel in result.validation_results.get("economic_relationships", []):
+                            if not rel["passed"]:
+                                print(f"     ❌ {rel['check_name']}: {rel.get('error_message', 'Failed')}")
+                        
+                        for outcome in result.validation_results.get("expected_outcomes", []):
+                            if not outcome["passed"]:
+                                print(f"     ❌ {outcome['field']}: Expected {outcome['should']}")
+                    
+                    if result.error_message:
+                        print(f"   Error: {result.error_message}")
+                    
+                    print("-" * 40)
+                    return result
+                    
+                except Exception as e:
+                    print(f"❌ Error executing {scenario_file.name}: {e}")
+                    return None
+        
+        results = [
+            result for result in await asyncio.gather(*(run_one(f) for f in scenario_files))
+            if result is not None
+        ]
+        
+        # Final summary
+        successful_scenarios = [r for r in results if r.success]
+        print(f"\n✅ Execution complete!")
+        print(f"   Total scenarios: {len(results)}")
+        print(f"   Successful: {len(successful_scenarios)}")
+        print(f"   Failed: {len(results) - len(successful_scenarios)}")
 
 if __name__ == "__main__":
     asyncio.run(main())